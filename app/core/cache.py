@@ -0,0 +1,89 @@
+# app/core/cache.py
+import logging
+from typing import Any, Awaitable, Callable
+
+from pydantic_core import from_json, to_json
+
+from app.core.config import REDIS_URL, CACHE_TTL_SECONDS
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # redis is optional; without it every lookup falls through to the DB
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+_redis = None
+
+
+# -----------------------
+# Lifecycle
+# -----------------------
+async def init_cache():
+    global _redis
+    if REDIS_URL and aioredis is not None:
+        _redis = aioredis.from_url(REDIS_URL)
+
+
+async def close_cache():
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+# -----------------------
+# Read-through cache
+# -----------------------
+async def cached(namespace: str, key: Any, loader: Callable[[], Awaitable[Any]], ttl: int = CACHE_TTL_SECONDS):
+    """
+    Return the cached JSON payload for namespace/key, or run `loader`, store its
+    result and return it. Keys carry the namespace version so `invalidate()` only
+    has to bump a counter. Redis errors never fail the request.
+    Single-row entries include the row's ETag in `key`, so a body cached under an
+    older version is never served with a newer one, even if invalidation fails.
+    The fill is SET NX: a loader that read the DB before a concurrent `store()`
+    never overwrites the value that `store()` wrote.
+    """
+    if _redis is None:
+        return await loader()
+
+    try:
+        version = await _redis.get(f"{namespace}:v") or b"0"
+        full_key = f"{namespace}:{version.decode()}:{key}"
+        hit = await _redis.get(full_key)
+        if hit is not None:
+            return from_json(hit)
+    except Exception as e:
+        logger.warning(f"Cache read failed for {namespace}: {e}")
+        return await loader()
+
+    value = await loader()
+    try:
+        await _redis.set(full_key, to_json(value), ex=ttl, nx=True)
+    except Exception as e:
+        logger.warning(f"Cache write failed for {namespace}: {e}")
+    return value
+
+
+async def invalidate(*namespaces: str):
+    """Drop every cached entry in the given namespaces."""
+    if _redis is None:
+        return
+    for namespace in namespaces:
+        try:
+            await _redis.incr(f"{namespace}:v")
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for {namespace}: {e}")
+
+
+async def store(namespace: str, key: Any, value: Any, ttl: int = CACHE_TTL_SECONDS):
+    """
+    Overwrite a single cached entry with a known-current value. Unlike
+    `invalidate()`, Redis errors propagate: callers use this where serving the
+    stale entry is not acceptable.
+    """
+    if _redis is None:
+        return
+    version = await _redis.get(f"{namespace}:v") or b"0"
+    await _redis.set(f"{namespace}:{version.decode()}:{key}", to_json(value), ex=ttl)
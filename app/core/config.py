@@ -10,11 +10,30 @@ if DB_TYPE == "postgres":
 else:
     DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
+# asyncpg prepared statement caches (per connection). Set to 0 when running
+# behind PgBouncer in transaction pooling mode.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1000"))
+
+# Connection pool (Postgres). Connections beyond POOL_SIZE + MAX_OVERFLOW wait.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Behind PgBouncer, let it do the pooling: open a connection per checkout instead.
+DB_EXTERNAL_POOL = os.getenv("DB_EXTERNAL_POOL", "false").lower() == "true"
+
+# Response cache for hot by-id reads. Leave REDIS_URL unset to disable it.
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "30"))
+LIST_COUNT_TTL_SECONDS = int(os.getenv("LIST_COUNT_TTL_SECONDS", "60"))
+
 JWT_SECRET = os.getenv("JWT_SECRET")
 if not JWT_SECRET:
     raise ValueError("JWT_SECRET environment variable must be set")
 JWT_ALGORITHM = "HS256"
 
+# bcrypt work factor for new hashes; existing hashes verify at their own cost.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 ACCESS_TOKEN_EXPIRE_MINUTES = 15          # For cashiers/sales/inventory
 ADMIN_ACCESS_TOKEN_EXPIRE_MINUTES = 60    # Admin access token
 REFRESH_TOKEN_EXPIRE_DAYS = 7             # Only admins get refresh tokens
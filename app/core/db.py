@@ -1,16 +1,41 @@
+import asyncio
+from datetime import datetime, timezone
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.core.config import DATABASE_URL
-from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker, declarative_base, raiseload
+from app.core.config import (
+    DATABASE_URL, DB_TYPE, DB_STATEMENT_CACHE_SIZE,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_EXTERNAL_POOL,
+)
+from sqlalchemy import event, text
+from sqlalchemy.pool import NullPool
 
 # -----------------------
 # Async engine
 # -----------------------
+engine_options = {}
+if DB_TYPE == "postgres":
+    # Reuse prepared statements for the repeated by-id / list queries instead
+    # of re-parsing and re-planning them on every request.
+    engine_options["connect_args"] = {
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,             # asyncpg
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,    # SQLAlchemy adapter
+    }
+    if DB_EXTERNAL_POOL:
+        engine_options["poolclass"] = NullPool
+    else:
+        engine_options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,   # True for debug SQL logs
     future=True,  # SQLAlchemy 2.0 style
+    **engine_options,
 )
 
 # -----------------------
@@ -30,6 +55,14 @@ AsyncSessionLocal: sessionmaker[AsyncSession] = sessionmaker(
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """
+    Python-side `onupdate` for version columns. Server `now()` is only
+    second-resolution on SQLite, so two writes in one second would share an ETag.
+    """
+    return datetime.now(timezone.utc)
+
+
 # -----------------------
 # FastAPI dependency
 # -----------------------
@@ -44,6 +77,21 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+
+# -----------------------
+# Loader guard
+# -----------------------
+def unloaded_relations():
+    """
+    Loader option for every relationship a query doesn't load explicitly.
+    Overrides the mapper-level eager defaults, and touching one of these
+    relationships raises InvalidRequestError naming it. An AsyncSession can't
+    lazy-load anyway (it would fail with MissingGreenlet), so the explicit
+    error applies in every environment.
+    """
+    return raiseload("*")
+
+
 # Enable foreign key support for SQLite
 @event.listens_for(engine.sync_engine, "connect")
 def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
@@ -56,9 +104,28 @@ import app.models
 # -----------------------
 # Optional: helper to create all tables (like Django migrate)
 # -----------------------
+def _create_missing_indexes(sync_conn):
+    """create_all() skips tables that already exist, so add any new indexes."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+async def warm_pool():
+    """Open the pool's base connections up front so the first requests don't pay the connect cost."""
+    if DB_TYPE != "postgres" or DB_EXTERNAL_POOL:
+        return
+    conns = await asyncio.gather(*(engine.connect() for _ in range(DB_POOL_SIZE)))
+    await asyncio.gather(*(conn.close() for conn in conns))
+
+
 async def init_models():
     """
     Call this on startup to create all tables defined in your models.
     """
     async with engine.begin() as conn:
+        if DB_TYPE == "postgres":
+            # Needed by the gin_trgm_ops search indexes
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
@@ -1,18 +1,26 @@
 # app/core/security.py
+import time
+import uuid
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from jose import jwt, JWTError
-from app.core.config import JWT_SECRET, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from app.core.config import JWT_SECRET, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, BCRYPT_ROUNDS
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
+# bcrypt is deliberately slow CPU work; async callers run these via
+# asyncio.to_thread so a hash never stalls the event loop.
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+def needs_rehash(hashed: str) -> bool:
+    """True when the hash was made with other settings than BCRYPT_ROUNDS."""
+    return pwd_context.needs_update(hashed)
+
 def create_access_token(data: Dict[str, str], token_version: int, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     now = datetime.utcnow()
@@ -34,10 +42,38 @@ def create_refresh_token(data: Dict[str, str], expires_delta: Optional[timedelta
         "exp": expire,
         "iat": now,
         "type": "refresh",
+        # Refresh tokens are stored with a unique constraint; two issued in the
+        # same second for the same user must still differ
+        "jti": uuid.uuid4().hex,
     })
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+# Verified access-token claims keyed by the raw token. Clients send the same
+# token on every request until it expires, so the HMAC check and JSON parse
+# run once per token rather than once per request.
+_CLAIMS_CACHE: Dict[str, Dict] = {}
+_CLAIMS_CACHE_SIZE = 1024
+
+
+def decode_access_claims(token: str) -> Dict:
+    """
+    Verify and decode an access token, reusing the claims of a token already
+    verified while it has not expired. Raises JWTError like jwt.decode.
+    Callers must treat the returned dict as read-only.
+    """
+    payload = _CLAIMS_CACHE.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+
+    payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    if len(_CLAIMS_CACHE) >= _CLAIMS_CACHE_SIZE:
+        # Oldest entry first (dicts keep insertion order)
+        _CLAIMS_CACHE.pop(next(iter(_CLAIMS_CACHE)), None)
+    _CLAIMS_CACHE[token] = payload
+    return payload
+
+
 def decode_token(token: str) -> Dict:
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
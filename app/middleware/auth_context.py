@@ -0,0 +1,32 @@
+# app/middleware/auth_context.py
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from jose import JWTError
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.security import decode_access_claims
+
+# Claims of the access token sent with the current request (None if missing or invalid)
+token_payload_ctx: ContextVar[Optional[dict]] = ContextVar("token_payload", default=None)
+
+
+class AuthContextMiddleware(BaseHTTPMiddleware):
+    """Decode the `token` header once per request and expose its claims via a ContextVar."""
+
+    async def dispatch(self, request: Request, call_next):
+        payload = None
+        token = request.headers.get("token")
+        if token:
+            try:
+                payload = decode_access_claims(token)
+            except JWTError:
+                # Leave it to get_current_user to reject the request on protected routes
+                payload = None
+
+        ctx_token = token_payload_ctx.set(payload)
+        try:
+            return await call_next(request)
+        finally:
+            token_payload_ctx.reset(ctx_token)
@@ -1,5 +1,5 @@
 # app/models/activity_models.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.core.db import Base
 
@@ -12,3 +12,13 @@ class UserActivity(Base):
        
     message = Column(String, nullable=False)      
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Default listing order; cursor pages seek straight to their first row
+        Index("ix_user_activity_created", created_at.desc(), id.desc()),
+        # username filter is ILIKE '%q%'; only a trigram index serves it. Postgres only
+        Index(
+            "ix_user_activity_username_trgm", "username",
+            postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
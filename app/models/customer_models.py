@@ -1,6 +1,6 @@
 # app/models/customer_models.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.db import Base
@@ -25,3 +25,21 @@ class Customer(Base):
     payments = relationship("Payment", back_populates="customer", cascade="all, delete-orphan", lazy="selectin")
     loyalty_tokens = relationship("LoyaltyToken", back_populates="customer", cascade="all, delete-orphan", lazy="selectin")
     complaints = relationship("Complaint", back_populates="customer", cascade="all, delete-orphan", lazy="joined")
+
+    __table_args__ = (
+        # Default list order; only active customers are ever listed
+        Index("ix_customer_active_created", created_at.desc(), postgresql_where=(is_active == True)),
+        # Substring search (ILIKE '%q%') can only use trigram indexes; Postgres only
+        Index(
+            "ix_customer_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_customer_email_trgm", "email",
+            postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_customer_phone_trgm", "phone",
+            postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -35,6 +35,7 @@ class GRN(Base):
 
     __table_args__ = (
         Index("ix_grn_supplier_status", "supplier_id", "status"),
+        Index("ix_grn_status_supplier_created", "status", "supplier_id", created_at.desc()),
     )
 
     def __repr__(self):
@@ -7,7 +7,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.db import Base
+from app.core.db import Base, utcnow
 
 
 class InvoiceStatus(str, enum.Enum):
@@ -42,7 +42,7 @@ class Invoice(Base):
 
     # Audit fields
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow, server_default=func.now())
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
 
@@ -61,6 +61,10 @@ class Invoice(Base):
     __table_args__ = (
         Index("ix_invoice_customer_status", "customer_id", "status"),
     )
+    # Fetch server-side created_at/updated_at with RETURNING on INSERT (updates
+    # stamp updated_at in Python), so a written invoice stays fully loaded
+    # without a refresh.
+    __mapper_args__ = {"eager_defaults": True}
 
     def __repr__(self):
         return f"<Invoice(id={self.id}, number='{self.invoice_number}', status='{self.status}')>"
@@ -1,10 +1,10 @@
 # app/models/product_models.py
 from sqlalchemy import (
     Column, Integer, String, Float, Boolean, CheckConstraint, Index,
-    ForeignKey, DateTime, func
+    ForeignKey, DateTime, and_, func, or_
 )
 from sqlalchemy.orm import relationship
-from app.core.db import Base
+from app.core.db import Base, utcnow
 import enum
 
 class LocationEnum(str, enum.Enum):
@@ -30,7 +30,7 @@ class Product(Base):
     stock_transfers = relationship("StockTransfer", back_populates="product", lazy="selectin")
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
 
@@ -42,6 +42,28 @@ class Product(Base):
         CheckConstraint(quantity_showroom >= 0, name="check_quantity_showroom_non_negative"),
         CheckConstraint(quantity_warehouse >= 0, name="check_quantity_warehouse_non_negative"),
         Index("ix_product_name_category", "name", "category"),
+        Index("ix_product_supplier_created", "supplier_id", created_at.desc()),
+        # Substring search (ILIKE '%q%') can only use trigram indexes; Postgres only
+        Index(
+            "ix_product_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_product_category_trgm", "category",
+            postgresql_using="gin", postgresql_ops={"category": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Covers only the low-stock rows; the predicate must stay identical to
+        # the alert condition in alerts_service for the planner to use it.
+        Index(
+            "ix_product_low_stock", "min_stock_threshold",
+            postgresql_where=and_(
+                is_deleted == False,
+                or_(
+                    quantity_showroom < min_stock_threshold,
+                    (quantity_showroom + quantity_warehouse) < min_stock_threshold,
+                ),
+            ),
+        ),
     )
 
     def __repr__(self):
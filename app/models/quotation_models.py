@@ -1,10 +1,10 @@
 # app/models/quotation_models.py
 from sqlalchemy import (
     Column, Integer, String, Boolean, ForeignKey,
-    DateTime, JSON, Numeric, event, func
+    DateTime, JSON, Numeric, Index, event, func
 )
 from sqlalchemy.orm import relationship
-from app.core.db import Base
+from app.core.db import Base, utcnow
 from decimal import Decimal
 
 GST_RATE = Decimal("0.18")  # use Decimal for arithmetic
@@ -38,7 +38,7 @@ class Quotation(Base):
     created_by = Column(Integer, nullable=True)
     updated_by = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
     is_deleted = Column(Boolean, default=False)
 
     # Relationships
@@ -60,6 +60,14 @@ class Quotation(Base):
     invoices = relationship("Invoice", back_populates="quotation", cascade="all, delete-orphan", lazy="selectin")
     complaints = relationship("Complaint", back_populates="quotation", cascade="all, delete-orphan", lazy="selectin")
 
+    __table_args__ = (
+        # Matches the list ordering so pages are read in index order, no sort
+        Index(
+            "ix_quotation_live_created", created_at.desc(), id.desc(),
+            postgresql_where=(is_deleted == False),
+        ),
+    )
+
     # ----------------------
     # Total calculation
     # ----------------------
@@ -98,7 +106,7 @@ class QuotationItem(Base):
     created_by = Column(Integer, nullable=True)
     updated_by = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
     is_deleted = Column(Boolean, default=False)
 
     quotation = relationship("Quotation", back_populates="items")
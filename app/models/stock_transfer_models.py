@@ -4,7 +4,7 @@ from sqlalchemy import (
     CheckConstraint, Index, func, select
 )
 from sqlalchemy.orm import relationship
-from app.core.db import Base
+from app.core.db import Base, utcnow
 import enum
 
 class LocationEnum(str, enum.Enum):
@@ -37,13 +37,18 @@ class StockTransfer(Base):
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     is_deleted = Column(Boolean, default=False, nullable=False)
 
     __table_args__ = (
         CheckConstraint("quantity > 0", name="check_transfer_quantity_positive"),
         Index("ix_transfer_product_status", "product_id", "status"),
+        # Status-filtered list, newest first
+        Index(
+            "ix_transfer_status_created", "status", created_at.desc(), id.desc(),
+            postgresql_where=(is_deleted == False),
+        ),
     )
 
     product = relationship("Product", back_populates="stock_transfers")
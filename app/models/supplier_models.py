@@ -1,7 +1,7 @@
 # app/models/supplier_models.py
 from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, func
 from sqlalchemy.orm import relationship
-from app.core.db import Base
+from app.core.db import Base, utcnow
 
 class Supplier(Base):
     __tablename__ = "suppliers"
@@ -19,7 +19,7 @@ class Supplier(Base):
     created_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     updated_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     grns = relationship("GRN", back_populates="supplier", lazy="selectin")
     products = relationship("Product", back_populates="supplier", lazy="selectin")
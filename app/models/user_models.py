@@ -1,5 +1,5 @@
 # app/models/user_models.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.db import Base
@@ -35,3 +35,11 @@ class RefreshToken(Base):
     revoked = Column(Boolean, default=False)
 
     user = relationship("User", back_populates="refresh_tokens")
+
+    __table_args__ = (
+        # Logout revokes a user's live tokens; revoked history is never scanned
+        Index(
+            "ix_refresh_token_active_user", "user_id",
+            postgresql_where=(revoked == False),
+        ),
+    )
@@ -5,38 +5,41 @@ from typing import Optional
 from app.core.db import get_db
 from app.services.activity_service import get_user_activities
 from app.schemas.activity_schemas import UserActivityOut, UserActivityListResponse
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
+from app.utils.pagination import decode_cursor
 
 router = APIRouter(prefix="/activities", tags=["User Activities"])
 
 @router.get("/", response_model=UserActivityListResponse)
-@require_role(["admin"])
 async def list_user_activities(
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin"])),
     user_id: Optional[int] = Query(None),
     username: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
     sort_by: str = Query("created_at"),
     order: str = Query("desc")
 ):
     """
     Fetch user activity logs with pagination, filtering, and sorting.
     """
-    total, activities = await get_user_activities(
+    total, activities, has_more, next_cursor = await get_user_activities(
         db=db,
         user_id=user_id,
         username=username,
         page=page,
         page_size=page_size,
         sort_by=sort_by,
-        order=order
+        order=order,
+        after=decode_cursor(cursor) if cursor else None,
     )
 
     return UserActivityListResponse(
         message="User activities fetched successfully",
         total=total,
-        data=[UserActivityOut.model_validate(a) for a in activities]
+        data=[UserActivityOut.model_validate(a) for a in activities],
+        has_more=has_more,
+        next_cursor=next_cursor,
     )
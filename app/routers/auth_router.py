@@ -10,7 +10,7 @@ from app.services.auth_service import (
     refresh_access_token,
     logout_user,
 )
-from app.utils.get_user import get_current_user
+from app.utils.get_user import get_current_user, store_cached_user
 from app.utils.activity_helpers import log_user_activity
 
 from app.services.alerts_service import get_stock_alerts
@@ -84,7 +84,7 @@ async def logout(
     current_user=Depends(get_current_user),
 ):
     """Logout user and revoke active tokens."""
-    response = await logout_user(db, current_user.username)
+    user = await logout_user(db, current_user.username)
 
     await log_user_activity(
         db=db,
@@ -93,5 +93,6 @@ async def logout(
         message=f"User '{current_user.username}' logged out.",
     )
     await db.commit()
+    await store_cached_user(current_user.username, user)
 
-    return response
+    return {"msg": "Logged out successfully"}
@@ -6,39 +6,35 @@ from app.schemas.customer_schema import (
 )
 from app.services import customer_service
 from app.core.db import get_db
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
 
 router = APIRouter(prefix="/billing/customers", tags=["Customers"])
 
 # CREATE
 @router.post("/", response_model=CustomerResponse)
-@require_role(["admin", "sales", "cashier"])
 async def create_customer_route(
     customer: CustomerCreate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"]))
 ):
     return await customer_service.create_customer(db, customer, _user)
 
 
 # GET SINGLE
 @router.get("/{customer_id}", response_model=CustomerResponse)
-@require_role(["admin", "sales", "cashier"])
 async def get_customer_route(
     customer_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"]))
 ):
     return await customer_service.get_customer(db, customer_id)
 
 
 # GET ALL WITH SEARCH, PAGINATION, SORTING
 @router.get("/", response_model=CustomerListResponse)
-@require_role(["admin", "sales", "cashier"])
 async def list_customers_route(
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"])),
     name: str = Query(None, description="Filter by name"),
     email: str = Query(None, description="Filter by email"),
     phone: str = Query(None, description="Filter by phone"),
@@ -52,22 +48,20 @@ async def list_customers_route(
 
 # UPDATE
 @router.put("/{customer_id}", response_model=CustomerResponse)
-@require_role(["admin"])
 async def update_customer_route(
     customer_id: int,
     customer: CustomerUpdate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin"]))
 ):
-    return await customer_service.update_customer(db, customer_id, customer.dict(exclude_unset=True), _user)
+    return await customer_service.update_customer(db, customer_id, customer, _user)
 
 
 # SOFT DELETE
 @router.delete("/{customer_id}", response_model=CustomerResponse)
-@require_role(["admin"])
 async def delete_customer_route(
     customer_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin"]))
 ):
     return await customer_service.delete_customer(db, customer_id, _user)
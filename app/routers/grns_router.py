@@ -2,8 +2,10 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+from datetime import date
 
 from app.core.db import get_db
+from app.core.cache import invalidate
 from app.services.grn_service import (
     create_grn,
     verify_grn,
@@ -16,8 +18,7 @@ from app.schemas.grn_schemas import (
     GRNListResponse,
     MessageResponse,
 )
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
 
 router = APIRouter(prefix="/grns", tags=["GRNs CRUD"])
 
@@ -25,11 +26,10 @@ router = APIRouter(prefix="/grns", tags=["GRNs CRUD"])
 # CREATE GRN
 # -----------------------------------------------------------
 @router.post("", response_model=GRNCreateResponse)
-@require_role(["admin", "inventory"])
 async def create_grn_route(
     grn: GRNCreate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
     return await create_grn(db, grn, current_user=_user)
 
@@ -38,27 +38,27 @@ async def create_grn_route(
 # VERIFY GRN
 # -----------------------------------------------------------
 @router.post("/{grn_id}/verify", response_model=GRNCreateResponse)
-@require_role(["admin"])
 async def verify_grn_route(
     grn_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin"])),
 ):
-    return await verify_grn(db, grn_id, current_user=_user)
+    result = await verify_grn(db, grn_id, current_user=_user)
+    await invalidate("product")
+    return result
 
 
 # -----------------------------------------------------------
 # LIST ALL GRNs (with filters + pagination)
 # -----------------------------------------------------------
 @router.get("", response_model=GRNListResponse)
-@require_role(["admin", "inventory"])
 async def list_grns(
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
     status: Optional[str] = Query(None, description="Filter by GRN status"),
     supplier_id: Optional[int] = Query(None, description="Filter by Supplier ID"),
-    start_date: Optional[str] = Query(None, description="Filter from created_at date (YYYY-MM-DD)"),
-    end_date: Optional[str] = Query(None, description="Filter until created_at date (YYYY-MM-DD)"),
+    start_date: Optional[date] = Query(None, description="Filter from created_at date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter until created_at date (YYYY-MM-DD)"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     sort_by: str = Query("created_at"),
@@ -71,10 +71,11 @@ async def list_grns(
 # DELETE GRN
 # -----------------------------------------------------------
 @router.delete("/{grn_id}", response_model=MessageResponse)
-@require_role(["admin"])
 async def delete_grn_route(
     grn_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin"])),
 ):
-    return await delete_grn(db, grn_id, current_user=_user)
+    result = await delete_grn(db, grn_id, current_user=_user)
+    await invalidate("product")
+    return result
@@ -1,13 +1,16 @@
 # app/routers/invoice_routers.py
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from datetime import date
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import FileResponse
-from decimal import Decimal
 from typing import List, Optional
 
-from app.core.db import get_db
+from app.core.db import get_db, AsyncSessionLocal
 from app.schemas.invoice_schemas import (
     InvoiceCreate,
+    InvoiceFromQuotation,
     InvoiceResponse,
     PaymentCreate,
     DiscountApply,
@@ -30,8 +33,12 @@ from app.services.invoice_service import (
 )
 from app.utils.get_user import get_current_user
 from app.utils.activity_helpers import log_user_activity
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
 from app.utils.pdf_generators.invoice_pdf import generate_invoice_pdf
+from app.utils.etag import fetch_version, weak_etag, etag_headers, is_not_modified
+from app.models.invoice_models import Invoice
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/invoices", tags=["Invoice"])
 
@@ -40,11 +47,10 @@ router = APIRouter(prefix="/invoices", tags=["Invoice"])
 # GET /billing/ready
 # ------------------------------------------------------------
 @router.get("/ready", response_model=ReadyToInvoiceResponse)
-@require_role(["admin", "cashier"])
 async def route_get_ready_to_invoice(
     db: AsyncSession = Depends(get_db),
     *,
-    _user=Depends(get_current_user)  # keyword-only argument required by @require_role
+    _user=Depends(RoleChecker(["admin", "cashier"]))
 ):
     """
     Get all quotations and sales orders that are ready to generate an invoice.
@@ -59,19 +65,16 @@ async def route_get_ready_to_invoice(
 # POST /billing
 # ------------------------------------------------------------
 @router.post("", response_model=InvoiceResponse, status_code=201)
-@require_role(["admin", "cashier"])
 async def route_create_invoice(
     payload: InvoiceCreate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "cashier"]))
 ):
     try:
-        invoice = await create_invoice(
-            _user,
-            db,
-            quotation_id=payload.quotation_id,
-            sales_order_id=payload.sales_order_id
-        )
+        if isinstance(payload, InvoiceFromQuotation):
+            invoice = await create_invoice(_user, db, quotation_id=payload.quotation_id)
+        else:
+            invoice = await create_invoice(_user, db, sales_order_id=payload.sales_order_id)
         return invoice
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -87,8 +90,8 @@ async def get_all_invoices_route(
     offset: int = 0,
     status: Optional[str] = None,
     customer_id: Optional[int] = None,
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
     current_user=Depends(get_current_user)
 ):
     invoices = await get_all_invoices(
@@ -107,15 +110,23 @@ async def get_all_invoices_route(
 # GET /billing/{invoice_id}
 # ------------------------------------------------------------
 @router.get("/{invoice_id}", response_model=InvoiceResponse)
-@require_role(["admin", "cashier"])
 async def route_get_invoice(
     invoice_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "cashier"]))
 ):
+    # Answer revalidations from the version column alone, before loading the invoice graph
+    version = await fetch_version(db, Invoice, invoice_id)
+    etag = weak_etag(invoice_id, version)
+    if version is not None and is_not_modified(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+
     invoice = await get_invoice_by_id(db, invoice_id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
+    response.headers.update(etag_headers(etag))
     return invoice
 
 
@@ -123,13 +134,14 @@ async def route_get_invoice(
 # GET /billing/customer/{customer_id}
 # ------------------------------------------------------------
 @router.get("/customer/{customer_id}", response_model=List[InvoiceResponse])
-@require_role(["admin", "cashier"])
 async def route_invoices_by_customer(
     customer_id: int,
+    limit: int = 50,
+    offset: int = 0,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "cashier"]))
 ):
-    invoices = await get_invoices_by_customer(db, customer_id)
+    invoices = await get_invoices_by_customer(db, customer_id, limit=limit, offset=offset)
     return invoices
 
 
@@ -137,12 +149,11 @@ async def route_invoices_by_customer(
 # POST /billing/{invoice_id}/discount
 # ------------------------------------------------------------
 @router.post("/{invoice_id}/discount", response_model=InvoiceResponse)
-@require_role(["admin", "cashier"])
 async def route_apply_discount(
     invoice_id: int,
     payload: DiscountApply,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "cashier"]))
 ):
     try:
         inv = await apply_discount(
@@ -161,12 +172,11 @@ async def route_apply_discount(
 # POST /billing/{invoice_id}/approve
 # ------------------------------------------------------------
 @router.post("/{invoice_id}/approve", response_model=ApproveResponse)
-@require_role(["admin"])
 async def route_approve_invoice(
     invoice_id: int,
     payload: Approve,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin"]))
 ):
     try:
         inv = await approve_invoice(_user, db, invoice_id, payload)
@@ -183,11 +193,10 @@ async def route_approve_invoice(
 # GET /billing/{invoice_id}/bill
 # ------------------------------------------------------------
 @router.get("/{invoice_id}/bill")
-@require_role(["admin", "cashier"])
 async def route_get_bill(
     invoice_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "cashier"]))
 ):
     try:
         bill = await get_final_bill(db, invoice_id)
@@ -200,12 +209,12 @@ async def route_get_bill(
 # POST /billing/payments/{invoice_id}
 # ------------------------------------------------------------
 @router.post("/payments/{invoice_id}", response_model=PaymentResponse)
-@require_role(["admin", "cashier"])
 async def route_add_payment(
     invoice_id: int,
     payload: PaymentCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "cashier"]))
 ):
     try:
         payment = await add_payment(
@@ -218,20 +227,47 @@ async def route_add_payment(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    # Loyalty and its activity log run after the response is sent, on
+    # sessions of their own; the request session closes with the request.
+    background_tasks.add_task(
+        _award_loyalty_and_log,
+        invoice_id=invoice_id,
+        user_id=_user.id,
+        username=_user.username,
+    )
+
+    return payment
+
+
+async def _award_loyalty_and_log(invoice_id: int, user_id: int, username: str):
+    # Payment has already succeeded; log failures rather than raising. The
+    # activity entry is only written when this payment claimed the loyalty.
     try:
-        await award_loyalty_for_invoice(_user, db, invoice_id=invoice_id)
-        await log_user_activity(
-            db=db,
-            user_id=_user.id,
-            username=_user.username,
-            message=f"Awarded loyalty tokens to Customer for Invoice"
-        )
-        await db.commit()
+        tokens = await _award_in_new_session(invoice_id=invoice_id)
+        if tokens is not None:
+            await _log_in_new_session(
+                user_id=user_id,
+                username=username,
+                message=f"Awarded {tokens} loyalty tokens to Customer for Invoice {invoice_id}"
+            )
     except Exception:
-        # Don't block payment success if loyalty fails
-        pass
+        logger.exception(f"Awarding loyalty for invoice {invoice_id} failed")
 
-    return payment
+
+async def _award_in_new_session(invoice_id: int) -> Optional[int]:
+    async with AsyncSessionLocal() as loyalty_db:
+        return await award_loyalty_for_invoice(None, loyalty_db, invoice_id=invoice_id)
+
+
+async def _log_in_new_session(user_id: int, username: str, message: str):
+    async with AsyncSessionLocal() as log_db:
+        await log_user_activity(
+            db=log_db,
+            user_id=user_id,
+            username=username,
+            message=message,
+            commit=True,
+        )
 
 
 # ------------------------------------------------------------
@@ -1,34 +1,31 @@
 # app/api/routers/loyalty.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.services.invoice_service import award_loyalty_for_invoice
 from app.models.invoice_models import LoyaltyToken
 from app.schemas.invoice_schemas import LoyaltyTokenResponse, LoyaltySummaryResponse
 from app.core.db import get_db
-from app.services.invoice_service import get_invoice_by_id
 from sqlalchemy import select
-from app.utils.check_roles import require_role
-from app.utils.get_user import get_current_user
+from app.utils.check_roles import RoleChecker
+from app.utils.etag import fetch_version, weak_etag, etag_headers, is_not_modified
 
 router = APIRouter()
 
 @router.get("/loyalty/{token_id}", response_model=LoyaltyTokenResponse, tags=["loyalty"])
-@require_role(["admin", "cashier", "sales"])
-async def get_loyalty_by_id(token_id: int, session: AsyncSession = Depends(get_db),_user=Depends(get_current_user)):
+async def get_loyalty_by_id(token_id: int, request: Request, response: Response, session: AsyncSession = Depends(get_db),_user=Depends(RoleChecker(["admin", "cashier", "sales"]))):
+    version = await fetch_version(session, LoyaltyToken, token_id)
+    etag = weak_etag(token_id, version)
+    if version is not None and is_not_modified(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+
     r = await session.execute(select(LoyaltyToken).where(LoyaltyToken.id == token_id))
     tok = r.scalar_one_or_none()
     if not tok:
         raise HTTPException(status_code=404, detail="Token not found")
+    response.headers.update(etag_headers(etag))
     return tok  # Pydantic will safely convert ORM to JSON
 
-from typing import List
-
-from sqlalchemy import func
-
 @router.get("/loyalty/customer/{customer_id}", response_model=LoyaltySummaryResponse, tags=["loyalty"])
-@require_role(["admin", "cashier", "sales"])
-async def get_loyalty_by_customer(customer_id: int, session: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
+async def get_loyalty_by_customer(customer_id: int, session: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier", "sales"]))):
 
     # Fetch all tokens for customer
     r = await session.execute(
@@ -5,22 +5,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.invoice_service import get_all_payments, get_payment_by_id
 from app.schemas.invoice_schemas import PaymentResponse
 from app.core.db import get_db
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
 from typing import Optional
-from app.utils.get_user import get_current_user
 
 
 router = APIRouter()
 
 @router.get("/payments", response_model=List[PaymentResponse])
-@require_role(["admin", "cashier"])
 async def route_get_payments(
     limit: int = 100,
     offset: int = 0,
     customer_id: Optional[int] = None,
     invoice_id: Optional[int] = None,
     session: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "cashier"]))
 ):
     """
     Retrieve all payments with optional filters for customer or invoice.
@@ -37,8 +35,7 @@ async def route_get_payments(
 
 
 @router.get("/payments/{payment_id}", response_model=PaymentResponse)
-@require_role(["admin", "cashier"])
-async def route_get_payment(payment_id: int, session: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
+async def route_get_payment(payment_id: int, session: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier"]))):
     """
     Retrieve a single payment by ID.
     """
@@ -1,10 +1,11 @@
 # app/routers/product_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.core.db import get_db
+from app.core.cache import cached, invalidate
 from app.services.product_service import (
     create_product,
     get_all_products,
@@ -19,8 +20,10 @@ from app.schemas.product_schemas import (
     ProductListResponse,
     MessageResponse,
 )
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
+from app.utils.pagination import decode_cursor
+from app.utils.etag import fetch_version, weak_etag, etag_headers, is_not_modified
+from app.models.product_models import Product
 
 router = APIRouter(prefix="/products", tags=["Products CRUD"])
 
@@ -28,11 +31,10 @@ router = APIRouter(prefix="/products", tags=["Products CRUD"])
 # CREATE PRODUCT
 # -----------------------------------------------------------
 @router.post("", response_model=ProductResponse)
-@require_role(["admin", "inventory"])
 async def create_product_route(
     data: ProductCreate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
     """
     Create a new product. Restricted to admin and inventory roles.
@@ -44,23 +46,24 @@ async def create_product_route(
 # LIST ALL PRODUCTS
 # -----------------------------------------------------------
 @router.get("", response_model=ProductListResponse)
-@require_role(["admin", "inventory"])
 async def list_products(
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
     search: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     supplier_id: Optional[int] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
     sort_by: str = Query("created_at"),
     order: str = Query("desc"),
 ):
     """
     List products with optional search, filters, pagination, and sorting.
     """
+    after = decode_cursor(cursor) if cursor else None
     return await get_all_products(
-        db, search, category, supplier_id, page, page_size, sort_by, order
+        db, search, category, supplier_id, page, page_size, sort_by, order, after
     )
 
 
@@ -68,46 +71,56 @@ async def list_products(
 # GET PRODUCT BY ID
 # -----------------------------------------------------------
 @router.get("/{product_id}", response_model=ProductResponse)
-@require_role(["admin", "inventory"])
 async def get_product_by_id(
     product_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
     """
     Retrieve a single product by ID. Restricted to admin and inventory roles.
     """
-    return await get_product(db, product_id)
+    version = await fetch_version(db, Product, product_id)
+    etag = weak_etag(product_id, version)
+    if version is not None and is_not_modified(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+
+    result = await cached("product", f"{product_id}:{etag}", lambda: get_product(db, product_id))
+    response.headers.update(etag_headers(etag))
+    return result
 
 
 # -----------------------------------------------------------
 # UPDATE PRODUCT
 # -----------------------------------------------------------
 @router.put("/{product_id}", response_model=ProductResponse)
-@require_role(["admin", "inventory"])
 async def update_product_route(
     product_id: int,
     data: ProductUpdate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
     """
     Update an existing product. Restricted to admin and inventory roles.
     """
-    return await update_product(db, product_id, data, _user)
+    result = await update_product(db, product_id, data, _user)
+    await invalidate("product")
+    return result
 
 
 # -----------------------------------------------------------
 # DELETE PRODUCT
 # -----------------------------------------------------------
 @router.delete("/{product_id}", response_model=MessageResponse)
-@require_role(["admin"])
 async def delete_product_route(
     product_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin"])),
 ):
     """
     Soft-delete a product. Restricted to admin role only.
     """
-    return await delete_product(db, product_id, _user)
+    result = await delete_product(db, product_id, _user)
+    await invalidate("product")
+    return result
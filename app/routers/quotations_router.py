@@ -1,11 +1,14 @@
 # app/routers/billing/quotation_router.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import os
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 
 from app.core.db import get_db
+from app.core.cache import cached, invalidate
 from app.schemas.quotation_schema import (
     QuotationResponse,
     QuotationListResponse,
@@ -24,9 +27,15 @@ from app.services.quotation_service import (
     move_to_sales,
     move_to_invoice
 )
-from app.utils.pdf_generators.quotation_pdf import generate_quotation_pdf
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.pdf_generators.quotation_pdf import (
+    resolve_quotation_pdf,
+    claim_quotation_render,
+    render_quotation_pdf,
+)
+from app.utils.check_roles import RoleChecker
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.etag import fetch_version, weak_etag, etag_headers, is_not_modified
+from app.models.quotation_models import Quotation
 
 router = APIRouter(prefix="/quotations", tags=["Quotations"])
 
@@ -34,11 +43,10 @@ router = APIRouter(prefix="/quotations", tags=["Quotations"])
 # CREATE QUOTATION
 # --------------------------
 @router.post("/", response_model=QuotationResponse, status_code=status.HTTP_201_CREATED)
-@require_role(["admin", "sales", "cashier"])
 async def create_quotation_route(
     data: QuotationCreate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"]))
 ):
     return await create_quotation(db, data, _user)
 
@@ -46,41 +54,54 @@ async def create_quotation_route(
 # GET SINGLE QUOTATION BY ID
 # --------------------------
 @router.get("/{quotation_id}", response_model=QuotationResponse)
-@require_role(["admin", "sales", "cashier"])
 async def get_quotation_route(
     quotation_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"]))
 ):
-    return await get_quotation(db, quotation_id)
+    version = await fetch_version(db, Quotation, quotation_id)
+    etag = weak_etag(quotation_id, version)
+    if version is not None and is_not_modified(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+
+    result = await cached("quotation", f"{quotation_id}:{etag}", lambda: get_quotation(db, quotation_id))
+    response.headers.update(etag_headers(etag))
+    return result
 
 # GET ALL QUOTATIONS (Paginated + Filtered)
 @router.get("", response_model=QuotationListResponse)
-@require_role(["admin", "sales", "cashier"])
 async def get_all_quotations(
     status: Optional[str] = Query(None, description="Filter by status (pending/approved/moved)"),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
     db: AsyncSession = Depends(get_db),
-    _user = Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"]))
 ):
-    data = await get_all_quotations_service(
+    after = decode_cursor(cursor) if cursor else None
+    data, has_more = await get_all_quotations_service(
         db, status=status, start_date=start_date, end_date=end_date,
-        page=page, page_size=page_size
+        page=page, page_size=page_size, after=after
     )
-    return {"message": "Quotations retrieved successfully", "data": data}
+    return {
+        "message": "Quotations retrieved successfully",
+        "data": data,
+        "has_more": has_more,
+        "next_cursor": next_cursor(data, page_size) if has_more else None,
+    }
 
 # --------------------------
 # GET QUOTATIONS BY CUSTOMER ID
 # --------------------------
 @router.get("/customer/{customer_id}", response_model=QuotationListResponse)
-@require_role(["admin", "sales", "cashier"])
 async def get_quotations_by_customer_route(
     customer_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"]))
 ):
     return await get_quotation_list_by_CID(db, customer_id)
 
@@ -88,88 +109,112 @@ async def get_quotations_by_customer_route(
 # UPDATE QUOTATION
 # --------------------------
 @router.put("/{quotation_id}", response_model=QuotationResponse)
-@require_role(["admin", "sales", "cashier"])
 async def update_quotation_route(
     quotation_id: int,
     data: QuotationUpdate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"]))
 ):
-    return await update_quotation(db, quotation_id, data, _user)
+    result = await update_quotation(db, quotation_id, data, _user)
+    await invalidate("quotation", "sales_order")
+    return result
 
 # -------------------------
 # DELETE QUOTATION (soft delete)
 # --------------------------
 @router.delete("/{quotation_id}", response_model=QuotationResponse)
-@require_role(["admin"])
 async def delete_quotation_route(
     quotation_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin"]))
 ):
-    return await delete_quotation(db, quotation_id, _user)
+    result = await delete_quotation(db, quotation_id, _user)
+    await invalidate("quotation")
+    return result
 
 # --------------------------
 # APPROVE QUOTATION
 # --------------------------
 @router.post("/{quotation_id}/approve", response_model=QuotationResponse)
-@require_role(["admin"])
 async def approve_quotation_route(
     quotation_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin"]))
 ):
-    return await approve_quotation(db, quotation_id, _user)
+    result = await approve_quotation(db, quotation_id, _user)
+    await invalidate("quotation")
+    return result
 
 # --------------------------
 # MOVE QUOTATION TO SALES
 # --------------------------
 @router.post("/{quotation_id}/move-to-sales", response_model=QuotationResponse)
-@require_role(["admin", "sales"])
 async def move_quotation_to_sales_route(
     quotation_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales"]))
 ):
-    return await move_to_sales(db, quotation_id, _user)
+    result = await move_to_sales(db, quotation_id, _user)
+    await invalidate("quotation")
+    return result
 
 # --------------------------
 # MOVE QUOTATION TO INVOICE
 # --------------------------
 @router.post("/{quotation_id}/move-to-invoice", response_model=QuotationResponse)
-@require_role(["admin", "sales", "cashier"])
 async def move_quotation_to_invoice_route(
     quotation_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales", "cashier"]))
 ):
-    return await move_to_invoice(db, quotation_id, _user)
+    result = await move_to_invoice(db, quotation_id, _user)
+    await invalidate("quotation")
+    return result
 
 # --------------------------
 # DELETE QUOTATION ITEM
 # --------------------------
 @router.delete("/items/{item_id}", response_model=QuotationResponse)
-@require_role(["admin", "sales"])
 async def delete_quotation_item_route(
     item_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales"]))
 ):
-    return await delete_quotation_item(db, item_id, _user)
+    result = await delete_quotation_item(db, item_id, _user)
+    await invalidate("quotation")
+    return result
 
 # --------------------------
 # GENERATE QUOTATION PDF
 # --------------------------
 @router.get("/{quotation_id}/pdf", response_class=FileResponse)
-@require_role(["admin", "sales"])
 async def download_quotation_pdf(
     quotation_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    _user = Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin", "sales"]))
 ):
-    file_path = await generate_quotation_pdf(db, quotation_id)
+    # Unchanged quotations resolve to an already-rendered file whose name
+    # carries a content hash, so the name doubles as the ETag.
+    file_path, snapshot = await resolve_quotation_pdf(db, quotation_id)
+
+    # First request for this version: render after responding, client polls
+    if not os.path.exists(file_path):
+        if claim_quotation_render(file_path):
+            background_tasks.add_task(render_quotation_pdf, file_path, snapshot)
+        return JSONResponse(
+            {"status": "pending", "poll": f"/quotations/{quotation_id}/pdf"},
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+    etag = f'W/"{os.path.splitext(os.path.basename(file_path))[0]}"'
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+
     return FileResponse(
         file_path,
         media_type="application/pdf",
-        filename=f"quotation_{quotation_id}.pdf"
+        filename=f"quotation_{quotation_id}.pdf",
+        headers=etag_headers(etag),
     )
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends
+import logging
+
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.db import get_db, AsyncSessionLocal
+from app.core.cache import cached, invalidate
 from app.schemas.sales_order_schema import (
     SalesOrderResponse,
     SalesOrderStatusUpdate,
@@ -19,71 +24,120 @@ from app.services.sales_order_service import (
     get_sales_orders_by_customer,
     get_work_status_by_order_id
 )
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
+from app.utils.etag import weak_etag, etag_headers, is_not_modified
+from app.models.sales_order_models import SalesOrder
+from app.models.quotation_models import Quotation
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/sales_orders", tags=["Sales Orders"])
 
 # GET approved or moved quotations
-@require_role(["admin", "cashier"])
 @router.get("/quotations/status", response_model=QuotationDetailMessageResponse)
-async def get_approved_moved_quotations(db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
-    return await get_approved_or_moved_quotations(db, _user)
+async def get_approved_moved_quotations(db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier"]))):
+    return await cached("quotation", "approved-moved", lambda: get_approved_or_moved_quotations(db, _user))
 
 # GET all sales orders
-@require_role(["admin", "cashier"])
-@router.get("/", response_model=list[SalesOrderResponse])
-async def get_all_orders(db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
-    return await get_all_sales_orders(db, _user)
+@router.get(
+    "/",
+    response_model=None,
+    response_class=StreamingResponse,
+    responses={200: {"model": list[SalesOrderResponse]}},
+)
+async def get_all_orders(_user=Depends(RoleChecker(["admin", "cashier"]))):
+    # Encode one order at a time so memory stays flat however many orders exist.
+    # The body streams after the endpoint returns, so it reads on a session of
+    # its own rather than get_db's, which FastAPI may close before the body is sent.
+    db = AsyncSessionLocal()
+    try:
+        orders = await get_all_sales_orders(db, _user)
+    except BaseException:
+        await db.close()
+        raise
+
+    async def body():
+        try:
+            separator = b"["
+            async for order in orders:
+                yield separator + order.model_dump_json().encode()
+                separator = b","
+            yield b"]"
+        except Exception:
+            # Headers are already sent; re-raise so the connection is aborted
+            # instead of ending a 200 with a valid-looking partial array
+            logger.exception("Streaming sales orders failed")
+            raise
+        finally:
+            await db.close()
+
+    return StreamingResponse(body(), media_type="application/json")
 
 # GET sales order by ID
-@require_role(["admin", "cashier"])
 @router.get("/{order_id}", response_model=SalesOrderResponse)
-async def get_order(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
-    return await get_sales_order_by_id(db, order_id, _user)
+async def get_order(order_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier"]))):
+    # The response embeds quotation details, so both rows version the ETag
+    versions = (await db.execute(
+        select(
+            func.coalesce(SalesOrder.updated_at, SalesOrder.created_at),
+            func.coalesce(Quotation.updated_at, Quotation.created_at),
+        )
+        .join(Quotation, SalesOrder.quotation_id == Quotation.id)
+        .where(SalesOrder.id == order_id)
+    )).first()
+    etag = weak_etag(order_id, *(versions or (None, None)))
+    if versions is not None and is_not_modified(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+
+    result = await cached("sales_order", f"{order_id}:{etag}", lambda: get_sales_order_by_id(db, order_id, _user))
+    response.headers.update(etag_headers(etag))
+    return result
 
 # GET sales orders by customer ID
-@require_role(["admin", "cashier"])
 @router.get("/customer/{customer_id}", response_model=list[SalesOrderResponse])
-async def get_orders_by_customer(customer_id: int, db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
+async def get_orders_by_customer(customer_id: int, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier"]))):
     orders = await get_sales_orders_by_customer(db, customer_id, _user)
     return orders
 
 # GET work status by order ID
-@require_role(["admin", "cashier", "inventory"])
 @router.get("/{order_id}/status", response_model=SalesOrderResponse)
-async def get_work_status(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
+async def get_work_status(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier", "inventory"]))):
     order = await get_work_status_by_order_id(db, order_id, _user)
     return order
 
 # POST create from quotation
-@require_role(["admin", "cashier"])
 @router.post("/{quotation_id}", response_model=SalesOrderResponse, status_code=201)
-async def create_order(quotation_id: int, db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
-    return await create_sales_order_from_quotation(db, quotation_id, _user)
+async def create_order(quotation_id: int, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier"]))):
+    result = await create_sales_order_from_quotation(db, quotation_id, _user)
+    await invalidate("quotation", "sales_order")
+    return result
 
 # POST approve order
-@require_role(["admin"])
 @router.post("/{order_id}/approve", response_model=SalesOrderResponse)
-async def approve_order_route(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
-    return await approve_order(db, order_id, _user)
+async def approve_order_route(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin"]))):
+    result = await approve_order(db, order_id, _user)
+    await invalidate("sales_order")
+    return result
 
 # PUT update work status
-@require_role(["admin", "cashier", "inventory"])
 @router.put("/{order_id}/status", response_model=SalesOrderResponse)
-async def update_status(order_id: int, status_update: SalesOrderStatusUpdate, db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
-    return await update_work_status(db, order_id, status_update.status, status_update.note or "", _user)
+async def update_status(order_id: int, status_update: SalesOrderStatusUpdate, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier", "inventory"]))):
+    result = await update_work_status(db, order_id, status_update.status, status_update.note or "", _user)
+    await invalidate("sales_order")
+    return result
 
 # PUT mark complete
-@require_role(["admin", "cashier"])
 @router.put("/{order_id}/complete", response_model=SalesOrderResponse)
-async def mark_complete(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
-    return await mark_sales_order_complete_service(db, order_id, _user)
+async def mark_complete(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier"]))):
+    result = await mark_sales_order_complete_service(db, order_id, _user)
+    await invalidate("sales_order")
+    return result
 
 # PUT move to invoice
-@require_role(["admin", "cashier"])
 @router.put("/{order_id}/move-to-invoice", response_model=SalesOrderResponse)
-async def move_invoice(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(get_current_user)):
-    return await move_sales_order_to_invoice(db, order_id, _user)
+async def move_invoice(order_id: int, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin", "cashier"]))):
+    result = await move_sales_order_to_invoice(db, order_id, _user)
+    await invalidate("sales_order")
+    return result
 
 
@@ -1,8 +1,9 @@
 # app/router/stock_transfer_router.py
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
+from app.core.cache import invalidate
 from app.services.stock_transfer_service import (
     create_stock_transfer,
     complete_stock_transfer,
@@ -17,8 +18,10 @@ from app.schemas.stock_transfer_schemas import (
     StockTransferOut,
     MessageResponse,
 )
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.etag import fetch_version, weak_etag, etag_headers, is_not_modified
+from app.models.stock_transfer_models import StockTransfer
 
 router = APIRouter(prefix="/transfers", tags=["Stock Transfers"])
 
@@ -27,78 +30,98 @@ router = APIRouter(prefix="/transfers", tags=["Stock Transfers"])
 # CREATE STOCK TRANSFER
 # --------------------------
 @router.post("", response_model=StockTransferOut)
-@require_role(["admin", "inventory"])
 async def create_transfer_route(
     transfer: StockTransferCreate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
-    return await create_stock_transfer(db, transfer, current_user=_user)
+    result = await create_stock_transfer(db, transfer, current_user=_user)
+    await invalidate("product")
+    return result
 
 
 # --------------------------
 # COMPLETE STOCK TRANSFER
 # --------------------------
 @router.post("/{transfer_id}/complete", response_model=StockTransferOut)
-@require_role(["admin", "inventory"])
 async def complete_transfer_route(
     transfer_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
-    return await complete_stock_transfer(db, transfer_id, current_user=_user)
+    result = await complete_stock_transfer(db, transfer_id, current_user=_user)
+    await invalidate("product")
+    return result
 
 
 # --------------------------
 # GET SINGLE STOCK TRANSFER
 # --------------------------
 @router.get("/{transfer_id}", response_model=StockTransferOut)
-@require_role(["admin", "inventory"])
 async def get_transfer_by_id(
     transfer_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
-    return await get_stock_transfer(db, transfer_id)
+    version = await fetch_version(db, StockTransfer, transfer_id)
+    etag = weak_etag(transfer_id, version)
+    if version is not None and is_not_modified(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+
+    transfer = await get_stock_transfer(db, transfer_id)
+    response.headers.update(etag_headers(etag))
+    return transfer
 
 
 # --------------------------
 # GET ALL STOCK TRANSFERS (Paginated + Filtered)
 # --------------------------
 @router.get("", response_model=list[StockTransferOut])
-@require_role(["admin", "inventory"])
 async def get_all_transfers(
+    response: Response,
     status: str = Query(None, description="Filter by status: pending/completed/cancelled"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    cursor: str = Query(None, description="X-Next-Cursor from the previous page; takes precedence over page"),
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
-    return await get_all_stock_transfers(db, status=status, page=page, page_size=page_size)
+    after = decode_cursor(cursor) if cursor else None
+    transfers = await get_all_stock_transfers(db, status=status, page=page, page_size=page_size, after=after)
+
+    # The body is a bare list, so the next cursor travels as a header
+    cursor_out = next_cursor(transfers, page_size)
+    if cursor_out:
+        response.headers["X-Next-Cursor"] = cursor_out
+    return transfers
 
 
 # --------------------------
 # UPDATE STOCK TRANSFER
 # --------------------------
 @router.put("/{transfer_id}", response_model=StockTransferOut)
-@require_role(["admin", "inventory"])
 async def update_transfer_route(
     transfer_id: int,
     data: StockTransferUpdate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
-    return await update_stock_transfer(db, transfer_id, data, current_user=_user)
+    result = await update_stock_transfer(db, transfer_id, data, current_user=_user)
+    await invalidate("product")
+    return result
 
 
 # --------------------------
 # DELETE STOCK TRANSFER
 # --------------------------
 @router.delete("/{transfer_id}", response_model=MessageResponse)
-@require_role(["admin"])
 async def delete_transfer_route(
     transfer_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin"])),
 ):
-    return await delete_stock_transfer(db, transfer_id, current_user=_user)
+    result = await delete_stock_transfer(db, transfer_id, current_user=_user)
+    await invalidate("product")
+    return result
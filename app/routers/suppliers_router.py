@@ -1,13 +1,15 @@
 # app/router/supplier_router.py
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.core.db import get_db
+from app.core.cache import cached, invalidate
 from app.services.supplier_service import (
     create_supplier,
     get_all_suppliers,
     get_supplier,
+    get_supplier_full,
     update_supplier,
     delete_supplier,
 )
@@ -16,14 +18,13 @@ from app.schemas.supplier_schemas import (
     SupplierUpdate,
     SupplierCreateResponse,
     SupplierListResponse,
+    SupplierFullResponse,
     MessageResponse,
-
 )
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
-
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
+from app.utils.pagination import decode_cursor
+from app.utils.etag import fetch_version, weak_etag, etag_headers, is_not_modified
+from app.models.supplier_models import Supplier
 
 router = APIRouter(prefix="/suppliers", tags=["Suppliers CRUD"])
 
@@ -32,67 +33,90 @@ router = APIRouter(prefix="/suppliers", tags=["Suppliers CRUD"])
 # CREATE SUPPLIER
 # -----------------------------------------------------------
 @router.post("", response_model=SupplierCreateResponse)
-@require_role(["admin", "inventory"])
 async def create_supplier_route(
     data: SupplierCreate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
-    return await create_supplier(db, data, _user)
+    result = await create_supplier(db, data, _user)
+    await invalidate("supplier")
+    return result
 
 
 # -----------------------------------------------------------
 # LIST ALL SUPPLIERS (with pagination, filters)
 # -----------------------------------------------------------
 @router.get("", response_model=SupplierListResponse)
-@require_role(["admin", "inventory"])
 async def list_suppliers(
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
     search: Optional[str] = Query(None, description="Search by supplier name or contact person"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
     sort_by: str = Query("created_at"),
     order: str = Query("desc"),
 ):
-    return await get_all_suppliers(db, search, page, page_size, sort_by, order)
+    after = decode_cursor(cursor) if cursor else None
+    return await get_all_suppliers(db, search, page, page_size, sort_by, order, after)
 
 
 # -----------------------------------------------------------
 # GET SUPPLIER BY ID
 # -----------------------------------------------------------
 @router.get("/{supplier_id}", response_model=SupplierCreateResponse)
-@require_role(["admin", "inventory"])
 async def get_supplier_by_id(
     supplier_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
+):
+    version = await fetch_version(db, Supplier, supplier_id)
+    etag = weak_etag(supplier_id, version)
+    if version is not None and is_not_modified(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+
+    result = await cached("supplier", f"{supplier_id}:{etag}", lambda: get_supplier(db, supplier_id))
+    response.headers.update(etag_headers(etag))
+    return result
+
+
+# -----------------------------------------------------------
+# GET SUPPLIER WITH PRODUCTS AND GRNS
+# -----------------------------------------------------------
+@router.get("/{supplier_id}/full", response_model=SupplierFullResponse)
+async def get_supplier_full_route(
+    supplier_id: int,
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
-    return await get_supplier(db, supplier_id)
+    return await get_supplier_full(supplier_id)
 
 
 # -----------------------------------------------------------
 # UPDATE SUPPLIER
 # -----------------------------------------------------------
 @router.put("/{supplier_id}", response_model=SupplierCreateResponse)
-@require_role(["admin", "inventory"])
 async def update_supplier_route(
     supplier_id: int,
     data: SupplierUpdate,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin", "inventory"])),
 ):
-    return await update_supplier(db, supplier_id, data, _user)
+    result = await update_supplier(db, supplier_id, data, _user)
+    await invalidate("supplier")
+    return result
 
 
 # -----------------------------------------------------------
 # DELETE SUPPLIER
 # -----------------------------------------------------------
 @router.delete("/{supplier_id}", response_model=MessageResponse)
-@require_role(["admin"])
 async def delete_supplier_route(
     supplier_id: int,
     db: AsyncSession = Depends(get_db),
-    _user=Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin"])),
 ):
-    return await delete_supplier(db, supplier_id, _user)
\ No newline at end of file
+    result = await delete_supplier(db, supplier_id, _user)
+    await invalidate("supplier")
+    return result
\ No newline at end of file
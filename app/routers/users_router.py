@@ -5,8 +5,8 @@ from app.core.db import get_db
 from app.schemas.user_schemas import (
     UserCreate, UserUpdate, UserResponse, UsersListResponse, MessageResponse
 )
-from app.utils.get_user import get_current_user
-from app.utils.check_roles import require_role
+from app.utils.check_roles import RoleChecker
+from app.utils.get_user import store_cached_user
 from app.services.user_service import (
     create_user, list_users, get_user_by_id, update_user, delete_user
 )
@@ -17,13 +17,14 @@ router = APIRouter(prefix="/users", tags=["Users CRUD"])
 # CREATE USER
 # ---------------------------
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-@require_role(["admin"])
 async def create_user_route(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db),
-    _user = Depends(get_current_user)
+    _user=Depends(RoleChecker(["admin"]))
 ):
     new_user = await create_user(db, user_data, _user)
+    # The username may have been freed by a rename, which left None cached for it
+    await store_cached_user(new_user.username, new_user)
     return {"msg": f"User '{new_user.username}' created successfully.", "data": new_user}
 
 
@@ -31,10 +32,9 @@ async def create_user_route(
 # LIST USERS WITH FILTERS & PAGINATION
 # ---------------------------
 @router.get("/", response_model=UsersListResponse)
-@require_role(["admin"])
 async def list_users_route(
     db: AsyncSession = Depends(get_db),
-    _user = Depends(get_current_user),
+    _user=Depends(RoleChecker(["admin"])),
     role: str | None = Query(None, description="Filter users by role"),
     is_active: bool | None = Query(None, description="Filter users by active status"),
     limit: int = Query(20, ge=1, le=100, description="Limit number of results"),
@@ -48,8 +48,7 @@ async def list_users_route(
 # GET SINGLE USER
 # ---------------------------
 @router.get("/{user_id}", response_model=UserResponse)
-@require_role(["admin"])
-async def get_user_route(user_id: int, db: AsyncSession = Depends(get_db), _user = Depends(get_current_user)):
+async def get_user_route(user_id: int, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin"]))):
     target_user = await get_user_by_id(db, user_id)
     return {"msg": f"User with ID {user_id} fetched successfully.", "data": target_user}
 
@@ -58,9 +57,14 @@ async def get_user_route(user_id: int, db: AsyncSession = Depends(get_db), _user
 # UPDATE USER
 # ---------------------------
 @router.put("/{user_id}", response_model=UserResponse)
-@require_role(["admin"])
-async def update_user_route(user_id: int, user_data: UserUpdate, db: AsyncSession = Depends(get_db), _user = Depends(get_current_user)):
+async def update_user_route(user_id: int, user_data: UserUpdate, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin"]))):
+    # Tokens carry the username the entry is cached under; a rename leaves
+    # nothing to authenticate under the old one
+    old_username = (await get_user_by_id(db, user_id)).username
     updated_user = await update_user(db, user_id, user_data, _user)
+    if updated_user.username != old_username:
+        await store_cached_user(old_username, None)
+    await store_cached_user(updated_user.username, updated_user)
     return {"msg": f"User '{updated_user.username}' updated successfully.", "data": updated_user}
 
 
@@ -68,7 +72,7 @@ async def update_user_route(user_id: int, user_data: UserUpdate, db: AsyncSessio
 # DELETE USER
 # ---------------------------
 @router.delete("/{user_id}", response_model=MessageResponse)
-@require_role(["admin"])
-async def delete_user_route(user_id: int, db: AsyncSession = Depends(get_db), _user = Depends(get_current_user)):
+async def delete_user_route(user_id: int, db: AsyncSession = Depends(get_db), _user=Depends(RoleChecker(["admin"]))):
     deleted_user = await delete_user(db, user_id, _user)
+    await store_cached_user(deleted_user.username, deleted_user)
     return {"msg": f"User '{deleted_user.username}' deleted successfully."}
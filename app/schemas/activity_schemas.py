@@ -1,19 +1,20 @@
 # app/schemas/activity_schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional, List
 
 class UserActivityOut(BaseModel):
     id: int
-    user_id: Optional[int]
-    username: Optional[str]
+    user_id: Optional[int] = None
+    username: Optional[str] = None
     message: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class UserActivityListResponse(BaseModel):
     message: str
     total: int
     data: List[UserActivityOut]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
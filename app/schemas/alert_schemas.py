@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import List
 
 class StockAlert(BaseModel):
@@ -8,8 +8,10 @@ class StockAlert(BaseModel):
     quantity_total: int
     min_stock_threshold: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+# Built once; validates a whole page of rows in a single call
+StockAlertListAdapter = TypeAdapter(List[StockAlert])
 
 class StockAlertListResponse(BaseModel):
     message: str
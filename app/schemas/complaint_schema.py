@@ -1,5 +1,5 @@
 # app/schemas/billing_schemas/complaint_schema.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 from app.models.complaint_models import ComplaintStatus, ComplaintPriority
@@ -22,11 +22,10 @@ class ComplaintUpdate(BaseModel):
 class ComplaintResponse(ComplaintBase):
     id: int
     customer_id: int
-    invoice_id: Optional[int]
-    sales_order_id: Optional[int]
-    quotation_id: Optional[int]
+    invoice_id: Optional[int] = None
+    sales_order_id: Optional[int] = None
+    quotation_id: Optional[int] = None
     created_at: datetime
-    updated_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
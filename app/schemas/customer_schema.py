@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional, Dict
+from pydantic import BaseModel, EmailStr, ConfigDict, TypeAdapter
+from typing import Any, List, Optional, Dict
 from datetime import datetime
 
 class CustomerBase(BaseModel):
@@ -19,6 +19,7 @@ class CustomerUpdate(BaseModel):
 
 class CustomerOut(CustomerBase):
     id: int
+    address: Any = None  # stored JSON, already validated on the way in; passed through as-is
     is_active: bool
     created_by: Optional[int] = None
     updated_by: Optional[int] = None
@@ -26,8 +27,10 @@ class CustomerOut(CustomerBase):
     updated_by_name: Optional[str] = None  # NEW
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Built once; validates a whole page of rows in a single call
+CustomerOutListAdapter = TypeAdapter(List[CustomerOut])
 
 class CustomerResponse(BaseModel):
     message: str
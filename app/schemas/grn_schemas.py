@@ -1,16 +1,19 @@
 # app/schemas/grn_schemas.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
 
+from app.schemas.response_schemas import ResponseMessage
+
 # --------------------------
 # GRN Schemas
 # --------------------------
 class GRNItemCreate(BaseModel):
     product_id: int
-    quantity: int
-    price: float
+    # Same bounds as the grn_items check constraints
+    quantity: int = Field(gt=0)
+    price: float = Field(ge=0)
 
 class GRNCreate(BaseModel):
     supplier_id: int
@@ -24,34 +27,30 @@ class GRNItemOut(GRNItemCreate):
     id: int
     total: float
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class GRNOut(BaseModel):
     id: int
     supplier_id: int
-    purchase_order: Optional[str]
+    purchase_order: Optional[str] = None
     sub_total: float
     total_amount: float
-    notes: Optional[str]
-    bill_number: Optional[str]
-    bill_file: Optional[str]
+    notes: Optional[str] = None
+    bill_number: Optional[str] = None
+    bill_file: Optional[str] = None
     created_by: int
-    verified_by: Optional[int]
+    verified_by: Optional[int] = None
     status: str
     created_at: datetime
     items: List[GRNItemOut]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
-class GRNCreateResponse(BaseModel):
-    message: str
-    data: GRNOut
+# Built once; validates a whole page of rows in a single call
+GRNOutListAdapter = TypeAdapter(List[GRNOut])
 
-class GRNListResponse(BaseModel):
-    message: str
-    data: List[GRNOut]
+GRNCreateResponse = ResponseMessage[GRNOut]
+GRNListResponse = ResponseMessage[List[GRNOut]]
 
 # --------------------------
 # Generic Message Response
@@ -1,10 +1,11 @@
 # app/schemas/invoice_schemas.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Discriminator, Field, ConfigDict, Tag
 from decimal import Decimal
-from typing import Optional, List
+from typing import Any, Optional, List, Union
 from datetime import datetime
 from typing_extensions import Annotated
 from app.models.invoice_models import InvoiceStatus
+from app.schemas.sales_order_schema import QuotationItemResponse
 
 # Define reusable constrained Decimal types
 PositiveDecimal = Annotated[Decimal, Field(gt=0, max_digits=14, decimal_places=2)]
@@ -24,28 +25,55 @@ class PaymentResponse(BaseModel):
     invoice_id: int
     customer_id: int
     amount: Decimal
-    payment_method: Optional[str]
+    payment_method: Optional[str] = None
     payment_date: datetime
 
-    class Config:
-        orm_mode = True
-        json_encoders = {Decimal: lambda v: str(v)}
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # -----------------------------
 # Invoice Schemas
 # -----------------------------
-class InvoiceCreate(BaseModel):
-    quotation_id: Optional[int] = None
-    sales_order_id: Optional[int] = None
+class InvoiceFromQuotation(BaseModel):
+    quotation_id: int
+
+
+class InvoiceFromSalesOrder(BaseModel):
+    sales_order_id: int
+
+
+def _invoice_source(payload) -> Optional[str]:
+    """Pick the variant from whichever id the client sent (quotation wins)."""
+    if isinstance(payload, dict):
+        if payload.get("quotation_id") is not None:
+            return "quotation"
+        if payload.get("sales_order_id") is not None:
+            return "sales_order"
+        return None
+    return "quotation" if isinstance(payload, InvoiceFromQuotation) else "sales_order"
+
+
+# Body is {"quotation_id": ...} or {"sales_order_id": ...}; validation goes
+# straight to the matching variant instead of trying both.
+InvoiceCreate = Annotated[
+    Union[
+        Annotated[InvoiceFromQuotation, Tag("quotation")],
+        Annotated[InvoiceFromSalesOrder, Tag("sales_order")],
+    ],
+    Discriminator(
+        _invoice_source,
+        custom_error_type="missing_invoice_source",
+        custom_error_message="Either quotation_id or sales_order_id must be provided",
+    ),
+]
 
 
 class InvoiceResponse(BaseModel):
     id: int
     invoice_number: str
     customer_id: int
-    quotation_id: Optional[int]
-    sales_order_id: Optional[int]
+    quotation_id: Optional[int] = None
+    sales_order_id: Optional[int] = None
     total_amount: Decimal
     discounted_amount: Decimal
     total_paid: Decimal
@@ -54,11 +82,9 @@ class InvoiceResponse(BaseModel):
     approved_by_admin: bool
     loyalty_claimed: bool
     created_at: datetime
-    updated_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
-        json_encoders = {Decimal: lambda v: str(v)}
+    model_config = ConfigDict(from_attributes=True)
 
 
 # -----------------------------
@@ -73,8 +99,7 @@ class Approve(BaseModel):
     discount_amount: Optional[NonNegativeDecimal] = None
     note: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ApproveResponse(BaseModel):
@@ -82,22 +107,12 @@ class ApproveResponse(BaseModel):
     status: InvoiceStatus
     approved_by_admin: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # -----------------------------
 # Ready to Invoice Schemas
 # -----------------------------
-class QuotationItemResponse(BaseModel):
-    id: int
-    product_id: int
-    product_name: Optional[str]
-    quantity: int
-    unit_price: Decimal
-    total: Decimal
-
-
 class QuotationReadyResponse(BaseModel):
     id: int
     quotation_number: str
@@ -112,9 +127,9 @@ class SalesOrderReadyResponse(BaseModel):
     id: int
     customer_id: int
     quotation_id: int
-    quotation_snapshot: Optional[List]
+    quotation_snapshot: Any = None  # stored JSON list, passed through without validation
     total_amount: Decimal  # calculated from quotation_snapshot if needed
-    customer_name: Optional[str]
+    customer_name: Optional[str] = None
 
 
 class ReadyToInvoiceResponse(BaseModel):
@@ -131,8 +146,7 @@ class LoyaltyTokenResponse(BaseModel):
     invoice_id: int
     tokens: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class LoyaltySummaryResponse(BaseModel):
@@ -1,9 +1,10 @@
 # app/schemas/product_schemas.py
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
 from app.models.product_models import LocationEnum
+from app.schemas.response_schemas import ResponseMessage
 
 # --------------------------
 # Base schema for Product
@@ -23,19 +24,11 @@ class ProductBase(BaseModel):
 class ProductCreate(BaseModel):
     name: str
     category: str
-    price: float
-    quantity_showroom: int
-    quantity_warehouse: int
-    min_stock_threshold: int
-
-    @field_validator('price', 'quantity_showroom', 'quantity_warehouse', 'min_stock_threshold')
-    def non_negative_values(cls, value):
-        """
-        Ensure numeric fields are non-negative.
-        """
-        if value < 0:
-            raise ValueError('Must be non-negative')
-        return value
+    # Numeric fields must be non-negative (checked natively by pydantic-core)
+    price: float = Field(ge=0)
+    quantity_showroom: int = Field(ge=0)
+    quantity_warehouse: int = Field(ge=0)
+    min_stock_threshold: int = Field(ge=0)
 
 
 # --------------------------
@@ -54,7 +47,7 @@ class ProductUpdate(ProductBase):
 class ProductOut(BaseModel):
     id: int
     name: str
-    category: Optional[str]
+    category: Optional[str] = None
     price: float
     quantity_showroom: int
     quantity_warehouse: int
@@ -63,21 +56,23 @@ class ProductOut(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Built once; validates a whole page of rows in a single call
+ProductOutListAdapter = TypeAdapter(List[ProductOut])
 
 
 # --------------------------
 # Response schemas
 # --------------------------
-class ProductResponse(BaseModel):
-    message: str
-    data: Optional[ProductOut] = None
+ProductResponse = ResponseMessage[ProductOut]
 
 
 class ProductListResponse(BaseModel):
     message: str
     data: List[ProductOut]
+    next_cursor: Optional[str] = None
 
 
 # --------------------------
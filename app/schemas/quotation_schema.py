@@ -1,9 +1,11 @@
 # app/schemas/quotation_schemas.py
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Any, List, Optional, Dict
 from datetime import datetime
 from decimal import Decimal
 
+from app.schemas.response_schemas import ResponseMessage
+
 # --------------------------
 # Quotation Item Schemas
 # --------------------------
@@ -19,8 +21,7 @@ class QuotationItemOut(BaseModel):
     quantity: int
     total: Decimal
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class QuotationItemUpdate(BaseModel):
     id: Optional[int] = None
@@ -52,31 +53,33 @@ class QuotationOut(BaseModel):
     id: int
     quotation_number: str
     customer_id: int
-    description: Optional[str]
-    notes: Optional[str]
+    description: Optional[str] = None
+    notes: Optional[str] = None
     total_items_amount: Decimal
     gst_amount: Decimal
     total_amount: Decimal
-    additional_data: Optional[Dict] = None
+    additional_data: Any = None  # free-form JSON, passed through without validation
     approved: bool
     moved_to_sales: bool
     moved_to_invoice: bool
     issue_date: datetime
     created_at: datetime
-    updated_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
 
-    items: List[QuotationItemOut] = []
+    items: List[QuotationItemOut] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Built once; validates a whole page of rows in a single call
+QuotationOutListAdapter = TypeAdapter(List[QuotationOut])
 
 # --------------------------
 # Response Schemas
 # --------------------------
-class QuotationResponse(BaseModel):
-    message: str
-    data: Optional[QuotationOut] = None
+QuotationResponse = ResponseMessage[QuotationOut]
 
 class QuotationListResponse(BaseModel):
     message: str
-    data: List[QuotationOut] = []
+    data: List[QuotationOut] = Field(default_factory=list)
+    has_more: bool = False
+    next_cursor: Optional[str] = None
@@ -1,10 +1,9 @@
 # app/schemas/response_schemas.py
 from pydantic import BaseModel
 from typing import Generic, TypeVar, Optional
-from pydantic.generics import GenericModel
 
 T = TypeVar("T")
 
-class ResponseMessage(GenericModel, Generic[T]):
+class ResponseMessage(BaseModel, Generic[T]):
     message: str
     data: Optional[T] = None
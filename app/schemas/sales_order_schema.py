@@ -1,80 +1,84 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from typing import Any, List, Optional
+from typing_extensions import NotRequired, TypedDict
+from datetime import datetime, timezone
+from functools import partial
 from decimal import Decimal
 
+from app.schemas.response_schemas import ResponseMessage
+
 
 # =====================================================
 # 🔹 Nested / Helper Schemas
 # =====================================================
-class CompletionStatusStep(BaseModel):
+# Entries of the completion_status / quotation_snapshot JSON columns. They are
+# always plain dicts, so TypedDicts validate them without building a model
+# instance per entry.
+class CompletionStatusStep(TypedDict):
     date: str
     status: str
-    note: Optional[str] = None
-
-    model_config = {"from_attributes": True}
+    note: NotRequired[Optional[str]]
 
 
-class SalesOrderItemResponse(BaseModel):
+class SalesOrderItemResponse(TypedDict):
     product_id: int
     product_name: str
     quantity: int
     unit_price: Decimal
     total_price: Decimal
 
-    model_config = {"from_attributes": True}
-
 
 class QuotationInfo(BaseModel):
     id: int
     quotation_number: str
-    description: Optional[str]
+    description: Optional[str] = None
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CustomerResponse(BaseModel):
     id: int
     name: str
     email: str
-    phone: Optional[str]
-    address: Optional[dict]
+    phone: Optional[str] = None
+    address: Any = None  # free-form JSON, passed through without validation
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
 
 class QuotationItemResponse(BaseModel):
     id: int
     product_id: int
-    product_name: Optional[str]
+    product_name: Optional[str] = None
     quantity: int
     unit_price: Decimal
     total: Decimal
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
 
 class QuotationDetailResponse(BaseModel):
     id: int
     quotation_number: str
-    description: Optional[str]
-    notes: Optional[str]
+    description: Optional[str] = None
+    notes: Optional[str] = None
     total_items_amount: Decimal
     gst_amount: Decimal
     total_amount: Decimal
     approved: bool
     moved_to_sales: bool
     created_at: datetime
-    updated_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
     customer: CustomerResponse
-    items: List[QuotationItemResponse] = []
+    items: List[QuotationItemResponse] = Field(default_factory=list)
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
 
-class QuotationDetailMessageResponse(BaseModel):
-    message: str
-    data: Optional[List[QuotationDetailResponse]] = None
+# Built once; validates a whole page of rows in a single call
+QuotationDetailListAdapter = TypeAdapter(List[QuotationDetailResponse])
+
+QuotationDetailMessageResponse = ResponseMessage[List[QuotationDetailResponse]]
 
 
 class QuotationStatusResponse(BaseModel):
@@ -83,9 +87,9 @@ class QuotationStatusResponse(BaseModel):
     customer_id: int
     approved: bool
     moved_to_sales: bool
-    updated_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
 
 # =====================================================
@@ -100,12 +104,7 @@ class SalesOrderListResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    model_config = {"from_attributes": True}
-
-
-class SalesOrderListMessage(BaseModel):
-    message: str
-    data: Optional[List[SalesOrderListResponse]] = None
+    model_config = ConfigDict(from_attributes=True)
 
 
 # =====================================================
@@ -125,12 +124,11 @@ class SalesOrderResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True)
 
 
-class SalesOrderMessageResponse(BaseModel):
-    message: str
-    data: Optional[List[QuotationDetailResponse]] = None
+# Built once; validates a whole page of rows in a single call
+SalesOrderListAdapter = TypeAdapter(List[SalesOrderResponse])
 
 
 # =====================================================
@@ -138,7 +136,7 @@ class SalesOrderMessageResponse(BaseModel):
 # =====================================================
 class SalesOrderMessage(BaseModel):
     message: str
-    date: datetime = Field(default_factory=datetime.utcnow)
+    date: datetime = Field(default_factory=partial(datetime.now, timezone.utc))
 
 
 # =====================================================
@@ -1,5 +1,5 @@
 # app/schemas/stock_transfer_schemas.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 from typing import Optional
 from app.models.stock_transfer_models import LocationEnum, TransferStatus
@@ -25,16 +25,15 @@ class StockTransferOut(BaseModel):
     to_location: LocationEnum
     status: TransferStatus
     transfer_date: datetime
-    completed_at: Optional[datetime]
+    completed_at: Optional[datetime] = None
     is_deleted: bool
 
     created_by: int
-    updated_by: Optional[int]
+    updated_by: Optional[int] = None
     created_at: datetime
-    updated_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # --------------------------
 # Generic Message Response
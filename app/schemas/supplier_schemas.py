@@ -1,9 +1,12 @@
 # app/schemas/supplier_schemas.py
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, ConfigDict, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.product_schemas import ProductOut
+from app.schemas.grn_schemas import GRNOut
+
 # -----------------------------
 # Supplier Schemas
 # -----------------------------
@@ -29,8 +32,11 @@ class SupplierOut(SupplierCreate):
     """Schema for returning supplier data"""
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+# Built once; validates a whole page of rows in a single call
+SupplierOutListAdapter = TypeAdapter(List[SupplierOut])
 
 
 class SupplierListResponse(BaseModel):
@@ -38,6 +44,8 @@ class SupplierListResponse(BaseModel):
     message: str
     total: int
     data: List[SupplierOut]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 class SupplierCreateResponse(BaseModel):
@@ -46,6 +54,14 @@ class SupplierCreateResponse(BaseModel):
     data: SupplierOut
 
 
+class SupplierFullResponse(BaseModel):
+    """Schema for returning a supplier with its products and GRNs"""
+    message: str
+    data: SupplierOut
+    products: List[ProductOut]
+    grns: List[GRNOut]
+
+
 class MessageResponse(BaseModel):
     """Generic message response"""
     message: str
@@ -1,6 +1,11 @@
 # app/schemas/user_schemas.py
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, StringConstraints
+from typing import Literal, Optional, List
+from typing_extensions import Annotated
+
+# Roles that can be assigned through the API; checked during request parsing
+UserRole = Literal["admin", "cashier", "sales", "inventory"]
+Password = Annotated[str, StringConstraints(min_length=6)]
 
 class UserLogin(BaseModel):
     username: str
@@ -16,18 +21,18 @@ class UserBase(BaseModel):
     role: str
 
 class UserCreate(UserBase):
-    password: str
+    role: UserRole
+    password: Password
 
 class UserUpdate(BaseModel):
     username: Optional[str] = None
-    password: Optional[str] = None
-    role: Optional[str] = None
+    password: Optional[Password] = None
+    role: Optional[UserRole] = None
 
 class UserOut(UserBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class MessageResponse(BaseModel):
     msg: str
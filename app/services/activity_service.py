@@ -4,9 +4,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from typing import List, Optional, Tuple
 from app.models.activity_models import UserActivity
+from app.utils.pagination import apply_keyset, next_cursor, trim_page
 
 ALLOWED_SORT_FIELDS = {"id", "user_id", "username", "created_at"}
 
+# (sort_by, descending) -> (ORDER BY column, id tie-breaker), built once at import
+_SORT_MAP = {
+    (field, descending): (
+        (desc if descending else asc)(getattr(UserActivity, field)),
+        (desc if descending else asc)(UserActivity.id),
+    )
+    for field in ALLOWED_SORT_FIELDS
+    for descending in (True, False)
+}
+
 async def get_user_activities(
     db: AsyncSession,
     user_id: Optional[int] = None,
@@ -14,15 +25,21 @@ async def get_user_activities(
     page: int = 1,
     page_size: int = 20,
     sort_by: str = "created_at",
-    order: str = "desc"
-) -> Tuple[int, List[UserActivity]]:
+    order: str = "desc",
+    after=None,
+) -> Tuple[int, List[UserActivity], bool, Optional[str]]:
+    """
+    Returns (total, page, has_more, next_cursor). Cursors are only issued for the
+    default created_at ordering, which ix_user_activity_created serves directly.
+    """
     try:
         # Validate sort field
         if sort_by not in ALLOWED_SORT_FIELDS:
             sort_by = "created_at"
 
-        sort_column = getattr(UserActivity, sort_by)
-        sort_order = desc(sort_column) if order.lower() == "desc" else asc(sort_column)
+        descending = order.lower() == "desc"
+        sort_order, tie_breaker = _SORT_MAP[(sort_by, descending)]
+        keyset = sort_by == "created_at"
 
         # Build filters
         filters = []
@@ -31,22 +48,32 @@ async def get_user_activities(
         if username:
             filters.append(UserActivity.username.ilike(f"%{username}%"))
 
-        # Base query
-        stmt = select(UserActivity)
-        count_stmt = select(func.count(UserActivity.id))
-        if filters:
-            stmt = stmt.where(*filters)
-            count_stmt = count_stmt.where(*filters)
-
-        # Count total
-        total_result = await db.execute(count_stmt)
-        total = total_result.scalar() or 0
+        # Page and total in one round trip: the window count is computed over
+        # the filtered set before OFFSET/LIMIT apply
+        stmt = (
+            select(UserActivity, func.count().over().label("total"))
+            .where(*filters)
+            .order_by(sort_order, tie_breaker)
+        )
+        seeking = after is not None and keyset
+        if seeking:
+            stmt = apply_keyset(stmt, UserActivity, after, descending)
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        rows = (await db.execute(stmt.limit(page_size + 1))).all()
+        rows, has_more = trim_page(rows, page_size)
+        activities = [row.UserActivity for row in rows]
 
-        # Pagination + sorting
-        stmt = stmt.order_by(sort_order).offset((page - 1) * page_size).limit(page_size)
-        result = await db.execute(stmt)
-        activities = result.scalars().all()
+        if rows and not seeking:
+            total = rows[0].total
+        elif seeking or page > 1:
+            # The window only sees rows past the cursor, and past the last page
+            # there is no row to carry it; count the filtered set directly
+            total = (await db.execute(select(func.count(UserActivity.id)).where(*filters))).scalar() or 0
+        else:
+            total = 0
 
-        return total, activities
+        cursor = next_cursor(activities, page_size) if keyset and has_more else None
+        return total, activities, has_more, cursor
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch activities: {e}")
@@ -4,9 +4,18 @@ from sqlalchemy.future import select
 from sqlalchemy import or_
 from typing import List
 from app.models.product_models import Product
-from app.schemas.alert_schemas import StockAlert
+from app.schemas.alert_schemas import StockAlert, StockAlertListAdapter
 from app.utils.activity_helpers import log_user_activity
 
+# Alerts read plain columns shaped like StockAlert instead of hydrating Products.
+STOCK_ALERT_COLUMNS = [
+    Product.id.label("product_id"),
+    Product.name.label("product_name"),
+    Product.quantity_showroom,
+    (Product.quantity_showroom + Product.quantity_warehouse).label("quantity_total"),
+    Product.min_stock_threshold,
+]
+
 async def get_stock_alerts(
     db: AsyncSession,
     current_user=None,
@@ -16,44 +25,35 @@ async def get_stock_alerts(
     """
     Fetch products that are below minimum stock thresholds.
     Only considers active products (is_deleted=False).
-    Optionally logs alert checks by the current user.
+    Optionally logs alert checks by the current user; the caller commits the log.
     Supports pagination.
     """
     try:
         offset = (page - 1) * page_size
 
+        # Same predicate as the ix_product_low_stock partial index; keep in sync
         alert_condition = or_(
             Product.quantity_showroom < Product.min_stock_threshold,
             (Product.quantity_showroom + Product.quantity_warehouse) < Product.min_stock_threshold
         )
 
         result = await db.execute(
-            select(Product)
+            select(*STOCK_ALERT_COLUMNS)
             .where(Product.is_deleted == False, alert_condition)
             .offset(offset)
             .limit(page_size)
         )
-        products = result.scalars().all()
+        rows = result.all()
 
         if current_user:
             await log_user_activity(
                 db,
                 user_id=current_user.id,
                 username=current_user.username,
-                message=f"{current_user.role.capitalize()} checked stock alerts ({len(products)} products below threshold)"
+                message=f"{current_user.role.capitalize()} checked stock alerts ({len(rows)} products below threshold)"
             )
-            await db.commit()
 
-        return [
-            StockAlert(
-                product_id=p.id,
-                product_name=p.name,
-                quantity_showroom=p.quantity_showroom,
-                quantity_total=p.quantity_showroom + p.quantity_warehouse,
-                min_stock_threshold=p.min_stock_threshold
-            )
-            for p in products
-        ]
+        return StockAlertListAdapter.validate_python([row._mapping for row in rows])
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stock alerts: {str(e)}")
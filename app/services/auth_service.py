@@ -1,13 +1,17 @@
 # app/services/auth_service.py
+import asyncio
 from datetime import timedelta
 from typing import Dict
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update
+from sqlalchemy.orm import joinedload
 
 from app.models.user_models import User, RefreshToken
 from app.core.security import (
+    hash_password,
+    needs_rehash,
     verify_password,
     create_access_token,
     create_refresh_token,
@@ -23,10 +27,14 @@ from app.core.config import (
 async def authenticate_user(db: AsyncSession, username: str, password: str):
     result = await db.execute(select(User).where(User.username == username))
     user = result.scalars().first()
-    if not user or not verify_password(password, user.password_hash):
+    if not user or not await asyncio.to_thread(verify_password, password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
+    # Upgrade hashes made at an older cost while the plain password is at hand;
+    # the login commit persists it
+    if needs_rehash(user.password_hash):
+        user.password_hash = await asyncio.to_thread(hash_password, password)
     return user
 
 
@@ -34,6 +42,8 @@ async def create_tokens(db: AsyncSession, user: User):
     """
     Create new access and refresh tokens.
     Includes token_version to support immediate logout invalidation.
+    The refresh token record is only added to the session; the caller commits it
+    together with the rest of the login.
     """
     expire_minutes = (
         ADMIN_ACCESS_TOKEN_EXPIRE_MINUTES
@@ -48,13 +58,11 @@ async def create_tokens(db: AsyncSession, user: User):
     )
 
     refresh_token = create_refresh_token(
-        {"sub": user.username, "type": "refresh"},
+        {"sub": user.username, "user_id": user.id, "type": "refresh"},
         expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
     )
 
-    user.refresh_token = refresh_token
-    await db.commit()
-    await db.refresh(user)
+    db.add(RefreshToken(user_id=user.id, token=refresh_token))
 
     return access_token, refresh_token
 
@@ -81,7 +89,9 @@ async def refresh_access_token(db: AsyncSession, old_refresh_token: str) -> Dict
     user_id = payload.get("user_id")
 
     result = await db.execute(
-        select(RefreshToken).where(RefreshToken.token == old_refresh_token)
+        select(RefreshToken)
+        .options(joinedload(RefreshToken.user))
+        .where(RefreshToken.token == old_refresh_token)
     )
     db_token = result.scalars().first()
 
@@ -91,11 +101,12 @@ async def refresh_access_token(db: AsyncSession, old_refresh_token: str) -> Dict
             detail="Invalid or reused refresh token",
         )
 
+    # Revocation and the new record go out in the caller's single commit
     db_token.revoked = True
-    await db.flush()
 
     new_access_token = create_access_token(
         {"sub": username, "user_id": user_id, "role": db_token.user.role},
+        token_version=db_token.user.token_version,
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
@@ -105,7 +116,6 @@ async def refresh_access_token(db: AsyncSession, old_refresh_token: str) -> Dict
 
     new_refresh_record = RefreshToken(user_id=user_id, token=new_refresh_token_str)
     db.add(new_refresh_record)
-    await db.flush()
 
     return {
         "access_token": new_access_token,
@@ -117,19 +127,22 @@ async def refresh_access_token(db: AsyncSession, old_refresh_token: str) -> Dict
 
 
 async def logout_user(db: AsyncSession, username: str):
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalars().first()
-    if not user:
+    # Bump token_version in place; RETURNING replaces the lookup SELECT and
+    # hands back the new state for the auth cache
+    result = await db.execute(
+        update(User)
+        .where(User.username == username)
+        .values(token_version=User.token_version + 1)
+        .returning(User)
+    )
+    user = result.scalar()
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.token_version += 1
-
     await db.execute(
         update(RefreshToken)
-        .where(RefreshToken.user_id == user.id)
+        .where(RefreshToken.user_id == user.id, RefreshToken.revoked == False)
         .values(revoked=True)
     )
 
-    await db.flush()
-
-    return {"msg": "Logged out successfully"}
+    return user
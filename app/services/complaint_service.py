@@ -1,6 +1,7 @@
 # app/services/billing_services/complaint_service.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.db import unloaded_relations
 from app.models.complaint_models import Complaint
 from app.utils.activity_helpers import log_user_activity
 
@@ -19,11 +20,11 @@ async def create_complaint(db: AsyncSession, complaint_data, _user):
     return complaint
 
 async def get_all_complaints(db: AsyncSession):
-    result = await db.execute(select(Complaint).where(Complaint.is_deleted==False))
+    result = await db.execute(select(Complaint).options(unloaded_relations()).where(Complaint.is_deleted==False))
     return result.scalars().all()
 
 async def get_complaint_by_id(db: AsyncSession, complaint_id: int):
-    result = await db.execute(select(Complaint).where(Complaint.id==complaint_id, Complaint.is_deleted==False))
+    result = await db.execute(select(Complaint).options(unloaded_relations()).where(Complaint.id==complaint_id, Complaint.is_deleted==False))
     return result.scalar_one_or_none()
 
 async def update_complaint(db: AsyncSession, complaint_id: int, data, _user):
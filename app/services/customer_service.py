@@ -1,17 +1,69 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from sqlalchemy.orm import aliased
 from sqlalchemy import asc, desc
 
+from app.core.db import unloaded_relations
 from app.models.customer_models import Customer
 from app.models.user_models import User  # Assuming User model exists
-from app.schemas.customer_schema import CustomerOut, CustomerResponse, CustomerListResponse, CustomerCreate
+from app.schemas.customer_schema import (
+    CustomerOut, CustomerOutListAdapter, CustomerResponse, CustomerListResponse, CustomerCreate, CustomerUpdate
+)
 
 from app.utils.activity_helpers import log_user_activity
 
+# Creator/updater aliases shared by every customer read
+created_user = aliased(User)
+updated_user = aliased(User)
+
+
+def _customer_with_user_names():
+    """Customer rows with creator/updater usernames resolved in the same query."""
+    return (
+        select(
+            Customer,
+            created_user.username.label("created_by_name"),
+            updated_user.username.label("updated_by_name")
+        )
+        .outerjoin(created_user, Customer.created_by == created_user.id)
+        .outerjoin(updated_user, Customer.updated_by == updated_user.id)
+        .options(unloaded_relations())
+    )
+
+
+# Flat columns for list pages; rows map straight onto CustomerOut without ORM objects
+CUSTOMER_LIST_COLUMNS = [
+    Customer.id,
+    Customer.name,
+    Customer.email,
+    Customer.phone,
+    Customer.address,
+    Customer.is_active,
+    Customer.created_by,
+    Customer.updated_by,
+    Customer.created_at,
+    created_user.username.label("created_by_name"),
+    updated_user.username.label("updated_by_name"),
+]
+
+
+async def _fetch_customer_with_users(db: AsyncSession, customer_id: int):
+    """(customer, created_by_name, updated_by_name) for an active customer, or None."""
+    result = await db.execute(
+        _customer_with_user_names().where(Customer.id == customer_id, Customer.is_active == True)
+    )
+    return result.first()
+
+
+def _customer_out(customer: Customer, created_by_name, updated_by_name) -> CustomerOut:
+    cust_out = CustomerOut.model_validate(customer)
+    cust_out.created_by_name = created_by_name
+    cust_out.updated_by_name = updated_by_name
+    return cust_out
+
 
 async def create_customer(db: AsyncSession, customer_data: CustomerCreate, current_user) -> CustomerResponse:
     try:
@@ -29,35 +81,11 @@ async def create_customer(db: AsyncSession, customer_data: CustomerCreate, curre
                 message=f"{current_user.role.capitalize()} created customer '{customer.name}' (ID: {customer.id})"
             )
         await db.commit()
-        await db.refresh(customer)
-
-        # Fetch again with User join to get names
-        created_user = aliased(User)
-        updated_user = aliased(User)
-        stmt = (
-            select(
-                Customer,
-                created_user.username.label("created_by_name"),
-                updated_user.username.label("updated_by_name")
-            )
-            .outerjoin(created_user, Customer.created_by == created_user.id)
-            .outerjoin(updated_user, Customer.updated_by == updated_user.id)
-            .where(Customer.id == customer.id)
-        )
-        result = await db.execute(stmt)
-        row = result.first()
-        cust, created_by_name, updated_by_name = row
-
-        cust_out = CustomerOut.from_orm(cust)
-        cust_out.created_by_name = created_by_name
-        cust_out.updated_by_name = updated_by_name
-
-
-
 
+        # The flush already returned id/created_at, and the creator is the current user
         return CustomerResponse(
             message="Customer created successfully",
-            data=cust_out
+            data=_customer_out(customer, current_user.username, current_user.username)
         )
 
     except IntegrityError as e:
@@ -77,31 +105,11 @@ async def create_customer(db: AsyncSession, customer_data: CustomerCreate, curre
 
 # GET SINGLE CUSTOMER
 async def get_customer(db: AsyncSession, customer_id: int) -> CustomerResponse:
-    created_user = aliased(User)
-    updated_user = aliased(User)
-    stmt = (
-        select(
-            Customer,
-            created_user.username.label("created_by_name"),
-            updated_user.username.label("updated_by_name")
-        )
-        .outerjoin(created_user, Customer.created_by == created_user.id)
-        .outerjoin(updated_user, Customer.updated_by == updated_user.id)
-        .where(Customer.id == customer_id, Customer.is_active == True)
-    )
-    result = await db.execute(stmt)
-    row = result.first()
-
+    row = await _fetch_customer_with_users(db, customer_id)
     if not row:
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    customer, created_by_name, updated_by_name = row
-
-    cust_out = CustomerOut.from_orm(customer)
-    cust_out.created_by_name = created_by_name
-    cust_out.updated_by_name = updated_by_name
-
-    return CustomerResponse(message="Customer retrieved successfully", data=cust_out)
+    return CustomerResponse(message="Customer retrieved successfully", data=_customer_out(*row))
 
 
 async def get_all_customers(
@@ -115,29 +123,23 @@ async def get_all_customers(
     order: str = "desc"
 ) -> CustomerListResponse:
 
-    created_user = aliased(User)
-    updated_user = aliased(User)
+    # Apply search filters
+    filters = [Customer.is_active == True]
+    if name:
+        filters.append(Customer.name.ilike(f"%{name}%"))
+    if email:
+        filters.append(Customer.email.ilike(f"%{email}%"))
+    if phone:
+        filters.append(Customer.phone.ilike(f"%{phone}%"))
 
     # Base query with joins
     query = (
-        select(
-            Customer,
-            created_user.username.label("created_by_name"),
-            updated_user.username.label("updated_by_name")
-        )
+        select(*CUSTOMER_LIST_COLUMNS)
         .outerjoin(created_user, Customer.created_by == created_user.id)
         .outerjoin(updated_user, Customer.updated_by == updated_user.id)
-        .where(Customer.is_active == True)
+        .where(*filters)
     )
 
-    # Apply search filters
-    if name:
-        query = query.where(Customer.name.ilike(f"%{name}%"))
-    if email:
-        query = query.where(Customer.email.ilike(f"%{email}%"))
-    if phone:
-        query = query.where(Customer.phone.ilike(f"%{phone}%"))
-
     # Allowed sort fields
     sort_col_map = {
         "name": Customer.name,
@@ -158,22 +160,17 @@ async def get_all_customers(
     sort_order = asc(sort_col) if order.lower() == "asc" else desc(sort_col)
     query = query.order_by(sort_order)
 
-    # Total count
-    count_query = select(func.count()).select_from(query.subquery())
+    # Total count (the user joins are outer and one-to-one, so they can't change it)
+    count_query = select(func.count()).select_from(Customer).where(*filters)
     total_result = await db.execute(count_query)
     total = total_result.scalar() or 0
 
     # Pagination
     query = query.offset(offset).limit(limit)
     result = await db.execute(query)
-    rows = result.unique().all()
+    rows = result.all()
 
-    customer_list = []
-    for customer, created_by_name, updated_by_name in rows:
-        cust_out = CustomerOut.from_orm(customer)
-        cust_out.created_by_name = created_by_name
-        cust_out.updated_by_name = updated_by_name
-        customer_list.append(cust_out)
+    customer_list = CustomerOutListAdapter.validate_python([row._mapping for row in rows])
 
     return CustomerListResponse(
         message="Customers retrieved successfully",
@@ -184,13 +181,26 @@ async def get_all_customers(
 
 
 # UPDATE CUSTOMER
-async def update_customer(db: AsyncSession, customer_id: int, data: dict, current_user) -> CustomerResponse:
-    customer = await db.get(Customer, customer_id)
-    if not customer or not customer.is_active:
+async def update_customer(db: AsyncSession, customer_id: int, data: CustomerUpdate, current_user) -> CustomerResponse:
+    # One UPDATE ... RETURNING hands back the row and its creator's name
+    created_by_name = (
+        select(created_user.username)
+        .where(created_user.id == Customer.created_by)
+        .scalar_subquery()
+        .label("created_by_name")
+    )
+    result = await db.execute(
+        update(Customer)
+        .where(Customer.id == customer_id, Customer.is_active == True)
+        .values(**data.model_dump(exclude_unset=True), updated_by=current_user.id)
+        .returning(Customer, created_by_name)
+        .options(unloaded_relations())
+        .execution_options(populate_existing=True)
+    )
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="Customer not found")
-    for key, value in data.items():
-        setattr(customer, key, value)
-    customer.updated_by = current_user.id
+    customer, created_by_name = row
 
     await log_user_activity(
             db,
@@ -201,21 +211,22 @@ async def update_customer(db: AsyncSession, customer_id: int, data: dict, curren
 
     await db.commit()
 
-    # Reuse get_customer to return a consistent, fully populated object
-    response = await get_customer(db, customer_id)
-    response.message = "Customer updated successfully"
-    return response
+    return CustomerResponse(
+        message="Customer updated successfully",
+        data=_customer_out(customer, created_by_name, current_user.username)
+    )
 
 
 # SOFT DELETE CUSTOMER
 async def delete_customer(db: AsyncSession, customer_id: int, current_user) -> CustomerResponse:
-    # Get the full customer object before deletion to ensure a consistent response.
-    response = await get_customer(db, customer_id)
+    # Snapshot the customer before deletion to ensure a consistent response.
+    row = await _fetch_customer_with_users(db, customer_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    response = CustomerResponse(message="Customer deleted successfully", data=_customer_out(*row))
 
     # Now, perform the soft delete.
-    customer = await db.get(Customer, customer_id)
-    if not customer or not customer.is_active:
-        raise HTTPException(status_code=404, detail="Customer not found")
+    customer = row[0]
     customer.is_active = False
     customer.updated_by = current_user.id
 
@@ -229,5 +240,4 @@ async def delete_customer(db: AsyncSession, customer_id: int, current_user) -> C
 
     await db.commit()
 
-    response.message = "Customer deleted successfully"
     return response
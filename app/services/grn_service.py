@@ -1,20 +1,21 @@
 # app/services/grn_service.py
 
-from datetime import datetime
+from datetime import date
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from sqlalchemy import func, desc, asc
+from sqlalchemy import func, desc, asc, insert
 from typing import Optional
 
+from app.core.db import unloaded_relations
 from app.models.grn_models import GRN, GRNItem
 from app.models.product_models import Product
 from app.models.supplier_models import Supplier
-from app.schemas.grn_schemas import GRNCreate, GRNOut
+from app.schemas.grn_schemas import GRNCreate, GRNOut, GRNOutListAdapter
 from app.utils.activity_helpers import log_user_activity
 
-ALLOWED_SORT_FIELDS = ["id", "created_at", "total_amount", "status"]
+ALLOWED_SORT_FIELDS = frozenset({"id", "created_at", "total_amount", "status"})
 
 # --------------------------
 # CREATE GRN
@@ -72,16 +73,20 @@ async def create_grn(db: AsyncSession, grn_data: GRNCreate, current_user) -> dic
         db.add(grn)
         await db.flush()  # Ensure GRN ID available
 
-        # Add GRN items
-        for item in grn_data.items:
-            grn_item = GRNItem(
-                grn_id=grn.id,
-                product_id=item.product_id,
-                quantity=item.quantity,
-                price=item.price,
-                total=item.quantity * item.price
-            )
-            db.add(grn_item)
+        # Add GRN items in a single multi-row INSERT
+        await db.execute(
+            insert(GRNItem),
+            [
+                {
+                    "grn_id": grn.id,
+                    "product_id": item.product_id,
+                    "quantity": item.quantity,
+                    "price": item.price,
+                    "total": item.quantity * item.price,
+                }
+                for item in grn_data.items
+            ],
+        )
 
         # Log activity before commit
         await log_user_activity(
@@ -95,7 +100,10 @@ async def create_grn(db: AsyncSession, grn_data: GRNCreate, current_user) -> dic
 
         # Return full GRN with items
         result = await db.execute(
-            select(GRN).options(selectinload(GRN.items)).where(GRN.id == grn.id, GRN.is_deleted == False)
+            select(GRN)
+            .options(selectinload(GRN.items).options(unloaded_relations()), unloaded_relations())
+            .where(GRN.id == grn.id, GRN.is_deleted == False)
+            .execution_options(populate_existing=True)
         )
         grn_full = result.scalars().first()
         return {"message": "GRN created successfully", "data": GRNOut.model_validate(grn_full)}
@@ -115,8 +123,8 @@ async def get_all_grns(
     db: AsyncSession,
     status: Optional[str] = None,
     supplier_id: Optional[int] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     page: int = 1,
     page_size: int = 20,
     sort_by: str = "created_at",
@@ -135,31 +143,31 @@ async def get_all_grns(
         stmt = select(GRN).where(GRN.is_deleted == False)
         count_stmt = select(func.count(GRN.id)).where(GRN.is_deleted == False)
 
-        # Apply filters
+        # Apply filters (statuses are stored lower-case, so a plain equality
+        # keeps ix_grn_status_supplier_created usable)
         if status:
-            stmt = stmt.where(GRN.status.ilike(status))
-            count_stmt = count_stmt.where(GRN.status.ilike(status))
+            stmt = stmt.where(GRN.status == status.lower())
+            count_stmt = count_stmt.where(GRN.status == status.lower())
 
         if supplier_id:
             stmt = stmt.where(GRN.supplier_id == supplier_id)
             count_stmt = count_stmt.where(GRN.supplier_id == supplier_id)
 
         if start_date:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            stmt = stmt.where(GRN.created_at >= start)
-            count_stmt = count_stmt.where(GRN.created_at >= start)
+            stmt = stmt.where(GRN.created_at >= start_date)
+            count_stmt = count_stmt.where(GRN.created_at >= start_date)
 
         if end_date:
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-            stmt = stmt.where(GRN.created_at <= end)
-            count_stmt = count_stmt.where(GRN.created_at <= end)
+            stmt = stmt.where(GRN.created_at <= end_date)
+            count_stmt = count_stmt.where(GRN.created_at <= end_date)
 
         # Total count
         total = (await db.execute(count_stmt)).scalar() or 0
 
         # Fetch paginated data
+        # GRNOut needs the items only; skip supplier/user/product loads
         stmt = (
-            stmt.options(selectinload(GRN.items))
+            stmt.options(selectinload(GRN.items).options(unloaded_relations()), unloaded_relations())
             .order_by(sort_order)
             .offset((page - 1) * page_size)
             .limit(page_size)
@@ -173,7 +181,7 @@ async def get_all_grns(
             "total": total,
             "page": page,
             "page_size": page_size,
-            "data": [GRNOut.model_validate(g) for g in grns],
+            "data": GRNOutListAdapter.validate_python(grns, from_attributes=True),
         }
 
     except Exception as e:
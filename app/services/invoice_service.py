@@ -1,18 +1,17 @@
 # app/services/invoice_service.py
 
 import datetime
-import random
-import string
+import uuid
 from decimal import Decimal
 from typing import Optional
 
 from sqlalchemy import (
-    select, update, or_, not_, exists, and_
+    select, insert, update, or_, not_, exists, and_, case, func, literal
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
+from app.core.db import unloaded_relations
 from app.models.invoice_models import Invoice, Payment, LoyaltyToken, InvoiceStatus
 from app.models import SalesOrder, Quotation
 from app.schemas.invoice_schemas import InvoiceResponse, Approve
@@ -25,10 +24,10 @@ from app.utils.activity_helpers import log_user_activity
 # -------------------------------------------------------------------------
 # Helper: Generate Unique Invoice Number
 # -------------------------------------------------------------------------
-async def _generate_invoice_number(session: AsyncSession, prefix: str = "INV"):
-    ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d%H%M%S")
-    suffix = ''.join(random.choices(string.digits, k=4))
-    return f"{prefix}-{ts}-{suffix}"
+def _generate_invoice_number(invoice_id: int, prefix: str = "INV"):
+    """Derived from the primary key, so it is unique without a retry loop."""
+    date = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d")
+    return f"{prefix}-{date}-{invoice_id:06d}"
 
 
 # -------------------------------------------------------------------------
@@ -38,6 +37,7 @@ async def get_ready_to_invoice(db: AsyncSession):
     # Get quotations ready for invoice
     q_stmt = (
         select(Quotation)
+        .options(selectinload(Quotation.items).options(unloaded_relations()), unloaded_relations())
         .where(Quotation.moved_to_sales == True)
         .where(Quotation.moved_to_invoice == False)
         .where(Quotation.approved == True)
@@ -72,6 +72,7 @@ async def get_ready_to_invoice(db: AsyncSession):
     # Get sales orders ready for invoice
     s_stmt = (
         select(SalesOrder)
+        .options(unloaded_relations())
         .where(SalesOrder.approved == True)
         .where(SalesOrder.moved_to_invoice == True)
         .where(not_(exists().where(Invoice.sales_order_id == SalesOrder.id)))
@@ -156,39 +157,34 @@ async def create_invoice(
 
     total_amount = to_decimal(total_amount)
 
-    for _ in range(5):
-        invoice_number = await _generate_invoice_number(session)
-        invoice = Invoice(
-            invoice_number=invoice_number,
-            customer_id=customer_id,
-            quotation_id=quotation_id,
-            sales_order_id=sales_order_id,
-            total_amount=total_amount,
-            discounted_amount=Decimal("0.00"),
-            total_paid=Decimal("0.00"),
-            balance_due=total_amount,
-            status=InvoiceStatus.PENDING,
-        )
-        session.add(invoice)
-        try:
-            await session.flush()
-            await log_user_activity(
-                db=session,
-                user_id=_user.id,
-                username=_user.username,
-                message=(
-                    f"Created Invoice '{invoice_number}' for Customer ID '{customer_id}', "
-                    f"linked to Quotation ID '{quotation_id}' and Sales Order ID '{sales_order_id}'. "
-                    f"Total Amount: ₹{total_amount:.2f}"
-                ),
-            )
-            await session.commit()
-            return invoice
-        except IntegrityError:
-            await session.rollback()
-            continue
-
-    raise RuntimeError("Could not generate unique invoice number after retries")
+    # Unique placeholder until the id is known; the final number is written with the commit
+    invoice = Invoice(
+        invoice_number=f"TEMP-{uuid.uuid4().hex}",
+        customer_id=customer_id,
+        quotation_id=quotation_id,
+        sales_order_id=sales_order_id,
+        total_amount=total_amount,
+        discounted_amount=Decimal("0.00"),
+        total_paid=Decimal("0.00"),
+        balance_due=total_amount,
+        status=InvoiceStatus.PENDING,
+    )
+    session.add(invoice)
+    await session.flush()
+    invoice.invoice_number = _generate_invoice_number(invoice.id)
+
+    await log_user_activity(
+        db=session,
+        user_id=_user.id,
+        username=_user.username,
+        message=(
+            f"Created Invoice '{invoice.invoice_number}' for Customer ID '{customer_id}', "
+            f"linked to Quotation ID '{quotation_id}' and Sales Order ID '{sales_order_id}'. "
+            f"Total Amount: ₹{total_amount:.2f}"
+        ),
+    )
+    await session.commit()
+    return invoice
 
 
 # -------------------------------------------------------------------------
@@ -204,7 +200,7 @@ async def apply_discount(
     discount_amount = to_decimal(discount_amount)
     result = await session.execute(
         select(Invoice)
-        .options(selectinload(Invoice.customer))
+        .options(unloaded_relations())
         .where(Invoice.id == invoice_id)
     )
     invoice = result.unique().scalar_one_or_none()
@@ -236,8 +232,8 @@ async def apply_discount(
         message=f"Applied discount of ₹{discount_amount:.2f} to Invoice ID {invoice.id}",
     )
 
+    # eager_defaults brings updated_at back with the UPDATE; nothing to refresh
     await session.commit()
-    await session.refresh(invoice)
     return InvoiceResponse.model_validate(invoice, from_attributes=True)
 
 
@@ -245,25 +241,43 @@ async def apply_discount(
 # Approve Invoice
 # -------------------------------------------------------------------------
 async def approve_invoice(_user, session: AsyncSession, invoice_id: int, payload: Approve):
-    r = await session.execute(select(Invoice).where(Invoice.id == invoice_id).with_for_update())
-    invoice = r.unique().scalar_one_or_none()
-
-    if invoice is None:
-        raise ValueError("Invoice not found")
-    if invoice.approved_by_admin:
-        raise ValueError("Invoice already approved")
-    if to_decimal(invoice.total_amount) <= Decimal("0.00"):
-        raise ValueError("Cannot approve invoice with zero total")
-
+    # Guarded UPDATE instead of SELECT ... FOR UPDATE: the checks are re-evaluated
+    # under the row lock, so concurrent approvers can't both win and nobody waits
+    # on a lock held across the business logic.
+    values = {"approved_by_admin": True, "status": InvoiceStatus.APPROVED}
+    conditions = [
+        Invoice.id == invoice_id,
+        Invoice.approved_by_admin == False,
+        Invoice.total_amount > 0,
+    ]
     if payload.discount_amount is not None:
         discount_amount = to_decimal(payload.discount_amount)
-        if discount_amount < 0 or discount_amount > invoice.total_amount:
+        if discount_amount < 0:
             raise ValueError("Invalid discount amount")
-        invoice.discounted_amount = discount_amount
-        invoice.balance_due = to_decimal(invoice.total_amount - invoice.discounted_amount - invoice.total_paid)
+        values["discounted_amount"] = discount_amount
+        values["balance_due"] = func.round(Invoice.total_amount - discount_amount - Invoice.total_paid, 2)
+        conditions.append(Invoice.total_amount >= discount_amount)
+
+    result = await session.execute(
+        update(Invoice)
+        .where(*conditions)
+        .values(**values)
+        .returning(Invoice)
+        .options(unloaded_relations())
+        .execution_options(populate_existing=True)
+    )
+    invoice = result.scalar_one_or_none()
 
-    invoice.approved_by_admin = True
-    invoice.status = InvoiceStatus.APPROVED
+    if invoice is None:
+        # Nothing matched; re-read only to report why
+        invoice = await session.get(Invoice, invoice_id, options=[unloaded_relations()])
+        if invoice is None:
+            raise ValueError("Invoice not found")
+        if invoice.approved_by_admin:
+            raise ValueError("Invoice already approved")
+        if to_decimal(invoice.total_amount) <= Decimal("0.00"):
+            raise ValueError("Cannot approve invoice with zero total")
+        raise ValueError("Invalid discount amount")
 
     await log_user_activity(
         db=session,
@@ -273,7 +287,6 @@ async def approve_invoice(_user, session: AsyncSession, invoice_id: int, payload
     )
 
     await session.commit()
-    await session.refresh(invoice)
     return invoice
 
 
@@ -291,15 +304,35 @@ async def add_payment(
     if amount <= Decimal("0.00"):
         raise ValueError("Payment amount must be positive")
 
-    result = await session.execute(select(Invoice).where(Invoice.id == invoice_id).with_for_update())
-    invoice = result.unique().scalar_one_or_none()
-    if invoice is None:
-        raise ValueError("Invoice not found")
-    if not invoice.approved_by_admin:
-        raise ValueError("Invoice not Approved")
+    # Apply the payment in one guarded UPDATE; concurrent payments on the same
+    # invoice serialise on the row for that statement only, and the balance
+    # check can't go stale between read and write.
+    remaining = func.round(Invoice.total_amount - Invoice.discounted_amount - Invoice.total_paid - amount, 2)
+    result = await session.execute(
+        update(Invoice)
+        .where(Invoice.id == invoice_id, Invoice.approved_by_admin == True, remaining >= 0)
+        .values(
+            total_paid=Invoice.total_paid + amount,
+            balance_due=remaining,
+            status=case(
+                (remaining == 0, literal(InvoiceStatus.PAID, Invoice.status.type)),
+                else_=literal(InvoiceStatus.PARTIALLY_PAID, Invoice.status.type),
+            ),
+        )
+        .returning(Invoice)
+        .options(unloaded_relations())
+        .execution_options(populate_existing=True)
+    )
+    invoice = result.scalar_one_or_none()
 
-    balance = to_decimal(invoice.total_amount - invoice.discounted_amount - invoice.total_paid)
-    if amount > balance:
+    if invoice is None:
+        # Nothing matched; re-read only to report why
+        invoice = await session.get(Invoice, invoice_id, options=[unloaded_relations()])
+        if invoice is None:
+            raise ValueError("Invoice not found")
+        if not invoice.approved_by_admin:
+            raise ValueError("Invoice not Approved")
+        balance = to_decimal(invoice.total_amount - invoice.discounted_amount - invoice.total_paid)
         raise ValueError(f"Payment exceeds balance. Max allowed: {balance}")
 
     payment = Payment(
@@ -310,13 +343,6 @@ async def add_payment(
     )
     session.add(payment)
 
-    invoice.total_paid = to_decimal(invoice.total_paid + amount)
-    invoice.balance_due = to_decimal(invoice.total_amount - invoice.discounted_amount - invoice.total_paid)
-    invoice.status = (
-        InvoiceStatus.PAID if invoice.balance_due == Decimal("0.00")
-        else InvoiceStatus.PARTIALLY_PAID
-    )
-
     await log_user_activity(
         db=session,
         user_id=_user.id,
@@ -337,11 +363,13 @@ async def award_loyalty_for_invoice(
     session: AsyncSession,
     invoice_id: int,
     token_rate_per_1000: int = 1,
-):
+) -> Optional[int]:
     """
     Awards loyalty tokens to the customer for a fully paid invoice.
     - Only executes if invoice status == PAID and loyalty not already claimed.
     - 1 token per 1000 units of currency by default.
+    Returns the number of tokens awarded (possibly 0) when this call claimed the
+    invoice's loyalty, or None when there was nothing to claim.
     """
     # Lock invoice row for safe update
     result = await session.execute(
@@ -354,7 +382,6 @@ async def award_loyalty_for_invoice(
 
     total_amount = to_decimal(invoice.total_amount)
     tokens = int((total_amount // Decimal("1000")) * token_rate_per_1000)
-    lt = None
 
     if tokens > 0:
         lt = LoyaltyToken(
@@ -371,7 +398,53 @@ async def award_loyalty_for_invoice(
     # ✅ Commit to persist both invoice and loyalty token changes
     await session.commit()
 
-    return lt if tokens > 0 else None
+    return tokens
+
+
+async def award_loyalty_bulk(
+    session: AsyncSession,
+    invoice_ids: list[int],
+    token_rate_per_1000: int = 1,
+) -> int:
+    """
+    Batch counterpart of award_loyalty_for_invoice for many paid invoices.
+    One SELECT, one multi-row INSERT and one UPDATE regardless of batch size;
+    rows locked by a concurrent award are skipped and left for the next run.
+    Returns the number of loyalty tokens rows created.
+    """
+    if not invoice_ids:
+        return 0
+
+    result = await session.execute(
+        select(Invoice.id, Invoice.customer_id, Invoice.total_amount)
+        .where(
+            Invoice.id.in_(invoice_ids),
+            Invoice.status == InvoiceStatus.PAID,
+            Invoice.loyalty_claimed == False,
+        )
+        .with_for_update(skip_locked=True)
+    )
+    eligible = result.all()
+    if not eligible:
+        return 0
+
+    token_rows = []
+    for invoice_id, customer_id, total_amount in eligible:
+        tokens = int((to_decimal(total_amount) // Decimal("1000")) * token_rate_per_1000)
+        if tokens > 0:
+            token_rows.append({"customer_id": customer_id, "invoice_id": invoice_id, "tokens": tokens})
+
+    if token_rows:
+        await session.execute(insert(LoyaltyToken), token_rows)
+    await session.execute(
+        update(Invoice)
+        .where(Invoice.id.in_([row.id for row in eligible]))
+        .values(loyalty_claimed=True)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+    return len(token_rows)
 
 
 
@@ -384,11 +457,12 @@ async def get_all_invoices(
     offset: int = 0,
     status: Optional[str] = None,
     customer_id: Optional[int] = None,
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
 ):
     """Fetch invoices with optional filters."""
-    stmt = select(Invoice)
+    # Only invoice columns are serialised; don't pull the relationship graph
+    stmt = select(Invoice).options(unloaded_relations())
 
     if status:
         stmt = stmt.where(Invoice.status == status)
@@ -400,12 +474,15 @@ async def get_all_invoices(
     stmt = stmt.order_by(Invoice.created_at.desc()).offset(offset).limit(limit)
 
     result = await db.execute(stmt)
-    return result.unique().scalars().all()
+    return result.scalars().all()
 
 
 async def get_invoice_by_id(session: AsyncSession, invoice_id: int) -> Optional[Invoice]:
-    res = await session.execute(select(Invoice).where(Invoice.id == invoice_id))
-    return res.unique().scalar_one_or_none()
+    # InvoiceResponse only carries the invoice's own columns; skip the relationship graph
+    res = await session.execute(
+        select(Invoice).options(unloaded_relations()).where(Invoice.id == invoice_id)
+    )
+    return res.scalar_one_or_none()
 
 
 async def get_invoices_by_customer(
@@ -414,14 +491,17 @@ async def get_invoices_by_customer(
     limit: int = 100,
     offset: int = 0,
 ):
+    # InvoiceResponse only carries invoice columns, so skip the mapper's
+    # default joined/selectin relationship loads for this page.
     res = await session.execute(
         select(Invoice)
         .where(Invoice.customer_id == customer_id)
-        .order_by(Invoice.created_at.desc())
+        .options(unloaded_relations())
+        .order_by(Invoice.created_at.desc(), Invoice.id.desc())
         .limit(limit)
         .offset(offset)
     )
-    return res.unique().scalars().all()
+    return res.scalars().all()
 
 
 # -------------------------------------------------------------------------
@@ -466,7 +546,8 @@ async def get_all_payments(
     Fetch all payments with optional filters for customer or invoice.
     Supports pagination.
     """
-    query = select(Payment)
+    # PaymentResponse is flat; skip the joined invoice and its cascade of loads
+    query = select(Payment).options(unloaded_relations())
 
     if customer_id:
         query = query.where(Payment.customer_id == customer_id)
@@ -476,7 +557,7 @@ async def get_all_payments(
     query = query.order_by(Payment.payment_date.desc()).limit(limit).offset(offset)
 
     res = await session.execute(query)
-    return res.unique().scalars().all()
+    return res.scalars().all()
 
 
 
@@ -7,14 +7,17 @@ from fastapi import HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import or_, asc, desc, func, exists
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
 
+from app.core.db import unloaded_relations
 from app.models.product_models import Product
 from app.models.grn_models import GRN, GRNItem
 from app.models.sales_order_models import SalesOrder
 from app.models.invoice_models import Invoice
-from app.schemas.product_schemas import ProductCreate, ProductUpdate, ProductOut
+from app.schemas.product_schemas import ProductCreate, ProductUpdate, ProductOut, ProductOutListAdapter
 from app.utils.activity_helpers import log_user_activity
+from app.utils.pagination import apply_keyset, next_cursor
 
 # --------------------------
 # Allowed fields for sorting
@@ -75,57 +78,52 @@ async def get_all_products(
     page_size: int = 20,
     sort_by: str = "created_at",
     order: str = "desc",
+    after: Optional[Tuple[datetime, int]] = None,
 ) -> dict:
     """
     Fetch products with optional search, filtering, pagination, and sorting.
+    When `after` (a decoded cursor) is given, seek past it instead of using OFFSET.
     """
     try:
         if sort_by not in ALLOWED_SORT_FIELDS:
             sort_by = "created_at"
 
-        sort_order = desc(sort_by) if order.lower() == "desc" else asc(sort_by)
+        descending = order.lower() == "desc"
+        sort_order = desc(sort_by) if descending else asc(sort_by)
+        tie_breaker = desc(Product.id) if descending else asc(Product.id)
 
-        # Base query
-        stmt = select(Product).where(Product.is_deleted == False)
-        count_stmt = select(func.count(Product.id)).where(Product.is_deleted == False)
-
-        # Apply search filters
+        # Shared by the page and count queries. On Postgres the ILIKE search is
+        # served by the trigram indexes and supplier_id by its composite index.
+        filters = [Product.is_deleted == False]
         if search:
-            stmt = stmt.where(
-                or_(
-                    Product.name.ilike(f"%{search}%"),
-                    Product.category.ilike(f"%{search}%")
-                )
-            )
-            count_stmt = count_stmt.where(
-                or_(
-                    Product.name.ilike(f"%{search}%"),
-                    Product.category.ilike(f"%{search}%")
-                )
-            )
-
-        # Apply category filter
+            pattern = f"%{search}%"
+            filters.append(or_(Product.name.ilike(pattern), Product.category.ilike(pattern)))
         if category:
-            stmt = stmt.where(Product.category == category)
-            count_stmt = count_stmt.where(Product.category == category)
-
-        # Apply supplier filter
+            filters.append(Product.category == category)
         if supplier_id:
-            stmt = stmt.where(Product.supplier_id == supplier_id)
-            count_stmt = count_stmt.where(Product.supplier_id == supplier_id)
+            filters.append(Product.supplier_id == supplier_id)
+
+        # Base query (ProductOut has no nested relations; skip the eager loads)
+        stmt = select(Product).options(unloaded_relations()).where(*filters)
+        count_stmt = select(func.count(Product.id)).where(*filters)
 
         # Total count
         total = (await db.execute(count_stmt)).scalar() or 0
 
         # Pagination
-        stmt = stmt.order_by(sort_order).offset((page - 1) * page_size).limit(page_size)
-        result = await db.execute(stmt)
+        stmt = stmt.order_by(sort_order, tie_breaker)
+        if after and sort_by == "created_at":
+            stmt = apply_keyset(stmt, Product, after, descending)
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        result = await db.execute(stmt.limit(page_size))
         products = result.scalars().all()
 
         return {
             "message": "Products fetched successfully",
             "total": total,
-            "data": [ProductOut.model_validate(p) for p in products],
+            "data": ProductOutListAdapter.validate_python(products, from_attributes=True),
+            "next_cursor": next_cursor(products, page_size) if sort_by == "created_at" else None,
         }
 
     except Exception as e:
@@ -14,6 +14,7 @@ from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 
+from app.core.db import unloaded_relations
 from app.models.quotation_models import Quotation, QuotationItem
 from app.models.customer_models import Customer
 from app.models.product_models import Product
@@ -23,9 +24,11 @@ from app.schemas.quotation_schema import (
     QuotationListResponse,
     QuotationCreate,
     QuotationUpdate,
-    QuotationItemOut
+    QuotationItemOut,
+    QuotationOutListAdapter
 )
 from app.utils.activity_helpers import log_user_activity
+from app.utils.pagination import apply_keyset, trim_page
 
 logger = logging.getLogger(__name__)
 
@@ -212,7 +215,7 @@ async def update_quotation(db: AsyncSession, quotation_id: int, data: QuotationU
 
     return QuotationResponse(
         message="Quotation updated successfully",
-        data=QuotationOut.from_orm(quotation)
+        data=QuotationOut.model_validate(quotation)
     )
 
 
@@ -268,7 +271,7 @@ async def approve_quotation(db: AsyncSession, quotation_id: int, _user) -> Quota
 
     await db.commit()
     await db.refresh(quotation)
-    return QuotationResponse(message="Quotation approved successfully", data=QuotationOut.from_orm(quotation))
+    return QuotationResponse(message="Quotation approved successfully", data=QuotationOut.model_validate(quotation))
 
 
 # --------------------------
@@ -298,7 +301,7 @@ async def move_to_sales(db: AsyncSession, quotation_id: int, _user) -> Quotation
 
     await db.commit()
     await db.refresh(quotation)
-    return QuotationResponse(message="Quotation moved to sales successfully", data=QuotationOut.from_orm(quotation))
+    return QuotationResponse(message="Quotation moved to sales successfully", data=QuotationOut.model_validate(quotation))
 
 
 # --------------------------
@@ -328,7 +331,7 @@ async def move_to_invoice(db: AsyncSession, quotation_id: int, _user) -> Quotati
 
     await db.commit()
     await db.refresh(quotation)
-    return QuotationResponse(message="Quotation moved to invoice successfully", data=QuotationOut.from_orm(quotation))
+    return QuotationResponse(message="Quotation moved to invoice successfully", data=QuotationOut.model_validate(quotation))
 
 
 # --------------------------
@@ -356,7 +359,7 @@ async def delete_quotation_item(db: AsyncSession, item_id: int, _user) -> Quotat
 
     await db.commit()
     await db.refresh(item.quotation)
-    return QuotationResponse(message="Quotation item deleted successfully", data=QuotationOut.from_orm(item.quotation))
+    return QuotationResponse(message="Quotation item deleted successfully", data=QuotationOut.model_validate(item.quotation))
 
 
 # --------------------------
@@ -387,9 +390,9 @@ async def get_all_quotations_service(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     page: int = 1,
-    page_size: int = 10
+    page_size: int = 10,
+    after=None,
 ):
-    offset = (page - 1) * page_size
     conditions = [Quotation.is_deleted == False]
 
     if status:
@@ -399,16 +402,21 @@ async def get_all_quotations_service(
 
     query = (
         select(Quotation)
+        .options(selectinload(Quotation.items).options(unloaded_relations()), unloaded_relations())
         .where(and_(*conditions))
-        .order_by(Quotation.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
+        .order_by(Quotation.created_at.desc(), Quotation.id.desc())
     )
+    if after:
+        query = apply_keyset(query, Quotation, after)
+    else:
+        query = query.offset((page - 1) * page_size)
+    # One extra row tells us whether another page exists, without a COUNT
+    query = query.limit(page_size + 1)
 
     result = await db.execute(query)
-    quotations = result.unique().scalars().all()
+    quotations, has_more = trim_page(result.scalars().all(), page_size)
 
-    return [QuotationOut.from_orm(q) for q in quotations]
+    return QuotationOutListAdapter.validate_python(quotations, from_attributes=True), has_more
 
 
 # --------------------------
@@ -417,7 +425,7 @@ async def get_all_quotations_service(
 async def get_quotation_list_by_CID(db: AsyncSession, customer_id: int) -> QuotationListResponse:
     result = await db.execute(
         select(Quotation)
-        .options(selectinload(Quotation.items))
+        .options(selectinload(Quotation.items).options(unloaded_relations()), unloaded_relations())
         .where(Quotation.customer_id == customer_id, Quotation.is_deleted == False)
     )
     quotations = result.scalars().all()
@@ -427,8 +435,8 @@ async def get_quotation_list_by_CID(db: AsyncSession, customer_id: int) -> Quota
     quotations_out = []
     for q in quotations:
         active_items = [item for item in q.items if not item.is_deleted]
-        q_out = QuotationOut.from_orm(q)
-        q_out.items = [QuotationItemOut.from_orm(item) for item in active_items]
+        q_out = QuotationOut.model_validate(q)
+        q_out.items = [QuotationItemOut.model_validate(item) for item in active_items]
         quotations_out.append(q_out)
 
     return QuotationListResponse(message="Quotations retrieved successfully", data=quotations_out)
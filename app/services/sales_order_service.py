@@ -1,15 +1,24 @@
 from datetime import datetime, timezone
+from typing import AsyncIterator
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.db import unloaded_relations
 from app.models.sales_order_models import SalesOrder
 from app.models.quotation_models import Quotation
-from app.schemas.sales_order_schema import SalesOrderResponse, QuotationDetailResponse
+from app.schemas.sales_order_schema import (
+    SalesOrderResponse,
+    SalesOrderListAdapter,
+    QuotationDetailListAdapter,
+)
 from app.utils.dec_to_float import decimal_to_float
 from app.utils.activity_helpers import log_user_activity
 
+# Rows fetched per round trip when streaming order lists
+STREAM_BATCH_SIZE = 200
+
 
 # =====================================================
 # 🔹 CREATE SALES ORDER
@@ -203,7 +212,11 @@ async def get_approved_or_moved_quotations(db: AsyncSession, _user) -> dict:
     subquery = select(SalesOrder.quotation_id)
     result = await db.execute(
         select(Quotation)
-        .options(selectinload(Quotation.items), selectinload(Quotation.customer))
+        .options(
+            selectinload(Quotation.items).options(unloaded_relations()),
+            joinedload(Quotation.customer).options(unloaded_relations()),
+            unloaded_relations(),
+        )
         .where(
             Quotation.moved_to_sales == True,
             ~Quotation.id.in_(subquery)
@@ -214,10 +227,7 @@ async def get_approved_or_moved_quotations(db: AsyncSession, _user) -> dict:
     if not quotations:
         raise HTTPException(status_code=404, detail="No approved or moved quotations found")
 
-    quotations_data = [
-        QuotationDetailResponse.model_validate(q, from_attributes=True)
-        for q in quotations
-    ]
+    quotations_data = QuotationDetailListAdapter.validate_python(quotations, from_attributes=True)
 
     # Log BEFORE commit
     await log_user_activity(
@@ -234,7 +244,9 @@ async def get_approved_or_moved_quotations(db: AsyncSession, _user) -> dict:
 # =====================================================
 async def get_sales_order_by_id(db: AsyncSession, order_id: int, _user) -> SalesOrderResponse:
     result = await db.execute(
-        select(SalesOrder).where(SalesOrder.id == order_id).options(selectinload(SalesOrder.quotation))
+        select(SalesOrder)
+        .where(SalesOrder.id == order_id)
+        .options(selectinload(SalesOrder.quotation).options(unloaded_relations()), unloaded_relations())
     )
     order = result.scalars().first()
     if not order:
@@ -245,14 +257,27 @@ async def get_sales_order_by_id(db: AsyncSession, order_id: int, _user) -> Sales
 # =====================================================
 # 🔹 GET ALL SALES ORDERS
 # =====================================================
-async def get_all_sales_orders(db: AsyncSession, _user) -> list[SalesOrderResponse]:
-    result = await db.execute(
-        select(SalesOrder).options(selectinload(SalesOrder.quotation)).order_by(SalesOrder.created_at.desc())
+async def get_all_sales_orders(db: AsyncSession, _user) -> AsyncIterator[SalesOrderResponse]:
+    """
+    Stream every sales order, newest first, fetching STREAM_BATCH_SIZE rows at a time.
+    Raises 404 before anything is yielded when there are no orders.
+    """
+    result = await db.stream_scalars(
+        select(SalesOrder)
+        .options(selectinload(SalesOrder.quotation).options(unloaded_relations()), unloaded_relations())
+        .order_by(SalesOrder.created_at.desc())
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
     )
-    orders = result.scalars().all()
-    if not orders:
+    first = await anext(result, None)
+    if first is None:
         raise HTTPException(status_code=404, detail="No sales orders found")
-    return [SalesOrderResponse.model_validate(o, from_attributes=True) for o in orders]
+
+    async def orders():
+        yield SalesOrderResponse.model_validate(first, from_attributes=True)
+        async for order in result:
+            yield SalesOrderResponse.model_validate(order, from_attributes=True)
+
+    return orders()
 
 
 # =====================================================
@@ -261,7 +286,7 @@ async def get_all_sales_orders(db: AsyncSession, _user) -> list[SalesOrderRespon
 async def get_sales_orders_by_customer(db: AsyncSession, customer_id: int, _user):
     result = await db.execute(
         select(SalesOrder)
-        .options(selectinload(SalesOrder.quotation))
+        .options(selectinload(SalesOrder.quotation).options(unloaded_relations()), unloaded_relations())
         .where(SalesOrder.customer_id == customer_id)
         .order_by(SalesOrder.created_at.desc())
     )
@@ -273,13 +298,13 @@ async def get_sales_orders_by_customer(db: AsyncSession, customer_id: int, _user
             detail=f"No sales orders found for customer ID {customer_id}"
         )
 
-    return orders
+    return SalesOrderListAdapter.validate_python(orders, from_attributes=True)
 
 
 async def get_work_status_by_order_id(db: AsyncSession, order_id: int, _user):
     result = await db.execute(
         select(SalesOrder)
-        .options(selectinload(SalesOrder.quotation))
+        .options(selectinload(SalesOrder.quotation).options(unloaded_relations()), unloaded_relations())
         .where(SalesOrder.id == order_id)
     )
     order = result.scalars().first()
@@ -9,6 +9,7 @@ from app.models.stock_transfer_models import StockTransfer, TransferStatus
 from app.models.product_models import Product
 from app.schemas.stock_transfer_schemas import StockTransferCreate, StockTransferUpdate
 from app.utils.activity_helpers import log_user_activity
+from app.utils.pagination import apply_keyset
 
 
 # ---------------------------------------------------
@@ -173,16 +174,21 @@ async def get_stock_transfer(db: AsyncSession, transfer_id: int):
 # ---------------------------------------------------
 # GET ALL STOCK TRANSFERS (with filters + pagination)
 # ---------------------------------------------------
-async def get_all_stock_transfers(db: AsyncSession, status: str = None, page: int = 1, page_size: int = 10):
+async def get_all_stock_transfers(db: AsyncSession, status: str = None, page: int = 1, page_size: int = 10, after=None):
     """
     Retrieve all stock transfers with optional status filter and pagination.
+    `after` is a decoded cursor; when given it replaces the page offset.
     """
     query = select(StockTransfer).where(StockTransfer.is_deleted == False)
     if status:
         query = query.where(StockTransfer.status == status)
 
-    query = query.order_by(StockTransfer.created_at.desc())
-    result = await db.execute(query.offset((page - 1) * page_size).limit(page_size))
+    query = query.order_by(StockTransfer.created_at.desc(), StockTransfer.id.desc())
+    if after:
+        query = apply_keyset(query, StockTransfer, after)
+    else:
+        query = query.offset((page - 1) * page_size)
+    result = await db.execute(query.limit(page_size))
     transfers = result.scalars().all()
     return transfers
 
@@ -1,11 +1,21 @@
 # app/services/supplier_services.py
+import asyncio
+import hashlib
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError, DataError
+from sqlalchemy.orm import selectinload
+from app.core.db import AsyncSessionLocal, unloaded_relations
+from app.core.cache import cached
+from app.core.config import LIST_COUNT_TTL_SECONDS
 from app.models.supplier_models import Supplier
-from app.schemas.supplier_schemas import SupplierCreate, SupplierUpdate, SupplierOut
+from app.schemas.supplier_schemas import SupplierCreate, SupplierUpdate, SupplierOut, SupplierOutListAdapter
+from app.schemas.product_schemas import ProductOutListAdapter
+from app.schemas.grn_schemas import GRNOutListAdapter
 from app.utils.activity_helpers import log_user_activity
+from app.utils.pagination import apply_keyset, next_cursor, trim_page
 from app.models.grn_models import GRN
 from app.models.product_models import Product
 from app.models.supplier_models import Supplier
@@ -21,6 +31,10 @@ ALLOWED_SORT_FIELDS = {
     "created_at": Supplier.created_at,
 }
 
+# List pages read plain columns (plus created_at for the cursor) instead of
+# hydrating Supplier instances.
+SUPPLIER_LIST_COLUMNS = [getattr(Supplier, field) for field in SupplierOut.model_fields] + [Supplier.created_at]
+
 
 # ---------------------------
 # CREATE SUPPLIER
@@ -66,12 +80,16 @@ async def get_all_suppliers(
     page_size: int = 20,
     sort_by: str = "created_at",
     order: str = "desc",
+    after=None,
 ) -> dict:
     try:
         sort_column = ALLOWED_SORT_FIELDS.get(sort_by, Supplier.created_at)
-        sort_order = desc(sort_column) if order.lower() == "desc" else asc(sort_column)
+        descending = order.lower() == "desc"
+        sort_order = desc(sort_column) if descending else asc(sort_column)
+        tie_breaker = desc(Supplier.id) if descending else asc(Supplier.id)
+        keyset = sort_column is Supplier.created_at
 
-        stmt = select(Supplier).where(Supplier.is_deleted == False)
+        stmt = select(*SUPPLIER_LIST_COLUMNS).where(Supplier.is_deleted == False)
         count_stmt = select(func.count(Supplier.id)).where(Supplier.is_deleted == False)
 
         if search:
@@ -88,18 +106,31 @@ async def get_all_suppliers(
                 )
             )
 
-        total = (await db.execute(count_stmt)).scalar() or 0
+        # Exact totals are only needed for page numbering; serve them from a
+        # short-lived cache (dropped on every supplier write) instead of
+        # scanning on each call.
+        search_key = hashlib.sha1((search or "").encode()).hexdigest()
+        total = await cached(
+            "supplier", f"count:{search_key}",
+            lambda: _scalar(db, count_stmt), ttl=LIST_COUNT_TTL_SECONDS,
+        )
 
-        stmt = stmt.order_by(sort_order).offset((page - 1) * page_size).limit(page_size)
-        result = await db.execute(stmt)
-        suppliers = result.scalars().all()
+        stmt = stmt.order_by(sort_order, tie_breaker)
+        if after and keyset:
+            stmt = apply_keyset(stmt, Supplier, after, descending)
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        result = await db.execute(stmt.limit(page_size + 1))
+        suppliers, has_more = trim_page(result.all(), page_size)
 
         return {
             "message": "Suppliers fetched successfully",
             "total": total,
             "page": page,
             "page_size": page_size,
-            "data": [SupplierOut.model_validate(s) for s in suppliers],
+            "data": SupplierOutListAdapter.validate_python([row._mapping for row in suppliers]),
+            "has_more": has_more,
+            "next_cursor": next_cursor(suppliers, page_size) if keyset and has_more else None,
         }
 
     except SQLAlchemyError as e:
@@ -108,12 +139,18 @@ async def get_all_suppliers(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+async def _scalar(db: AsyncSession, stmt):
+    return (await db.execute(stmt)).scalar() or 0
+
+
 # ---------------------------
 # GET SINGLE SUPPLIER
 # ---------------------------
 async def get_supplier(db: AsyncSession, supplier_id: int) -> dict:
     result = await db.execute(
-        select(Supplier).where(Supplier.id == supplier_id, Supplier.is_deleted == False)
+        select(Supplier)
+        .options(unloaded_relations())
+        .where(Supplier.id == supplier_id, Supplier.is_deleted == False)
     )
     supplier = result.scalars().first()
     if not supplier:
@@ -121,6 +158,50 @@ async def get_supplier(db: AsyncSession, supplier_id: int) -> dict:
     return {"message": "Supplier fetched successfully", "data": SupplierOut.model_validate(supplier)}
 
 
+# ---------------------------
+# GET SUPPLIER WITH PRODUCTS AND GRNS
+# ---------------------------
+async def _supplier_products(db: AsyncSession, supplier_id: int) -> list:
+    result = await db.execute(
+        select(Product)
+        .options(unloaded_relations())
+        .where(Product.supplier_id == supplier_id, Product.is_deleted == False)
+        .order_by(Product.created_at.desc(), Product.id.desc())
+    )
+    return ProductOutListAdapter.validate_python(result.scalars().all(), from_attributes=True)
+
+
+async def _supplier_grns(db: AsyncSession, supplier_id: int) -> list:
+    result = await db.execute(
+        select(GRN)
+        .options(selectinload(GRN.items).options(unloaded_relations()), unloaded_relations())
+        .where(GRN.supplier_id == supplier_id, GRN.is_deleted == False)
+        .order_by(GRN.created_at.desc(), GRN.id.desc())
+    )
+    return GRNOutListAdapter.validate_python(result.scalars().all(), from_attributes=True)
+
+
+async def _in_own_session(fetch, supplier_id: int):
+    # An AsyncSession can't run concurrent queries, so each branch gets its own
+    async with AsyncSessionLocal() as session:
+        return await fetch(session, supplier_id)
+
+
+async def get_supplier_full(supplier_id: int) -> dict:
+    """Supplier, its products and its GRNs, fetched concurrently."""
+    supplier, products, grns = await asyncio.gather(
+        _in_own_session(get_supplier, supplier_id),
+        _in_own_session(_supplier_products, supplier_id),
+        _in_own_session(_supplier_grns, supplier_id),
+    )
+    return {
+        "message": "Supplier fetched successfully",
+        "data": supplier["data"],
+        "products": products,
+        "grns": grns,
+    }
+
+
 # ---------------------------
 # UPDATE SUPPLIER
 # ---------------------------
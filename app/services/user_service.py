@@ -1,34 +1,36 @@
 # app/services/user_services.py
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from fastapi import HTTPException, status
 from app.models.user_models import User
+from app.core.config import DB_TYPE
 from app.core.security import hash_password
 from app.schemas.user_schemas import UserCreate, UserUpdate
 from app.utils.activity_helpers import log_user_activity
 
-ALLOWED_ROLES = {"admin", "cashier", "sales", "inventory"}
+# Both backends support INSERT ... ON CONFLICT DO NOTHING
+_insert = pg_insert if DB_TYPE == "postgres" else sqlite_insert
 
 
 # CREATE USER
 async def create_user(db: AsyncSession, user_data: UserCreate, current_user):
-    existing = await db.execute(select(User).where(User.username == user_data.username))
-    if existing.scalars().first():
+    password_hash = await asyncio.to_thread(hash_password, user_data.password)
+
+    # Uniqueness check and insert in one statement; no race between them
+    result = await db.execute(
+        _insert(User)
+        .values(username=user_data.username, password_hash=password_hash, role=user_data.role)
+        .on_conflict_do_nothing(index_elements=[User.username])
+        .returning(User.id)
+    )
+    user_id = result.scalar()
+    if user_id is None:
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    if user_data.role not in ALLOWED_ROLES:
-        raise HTTPException(status_code=400, detail=f"Role must be one of {ALLOWED_ROLES}")
-
-    if len(user_data.password) < 6:
-        raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
-
-    new_user = User(
-        username=user_data.username,
-        password_hash=hash_password(user_data.password),
-        role=user_data.role
-    )
-    db.add(new_user)
-    await db.flush()
+    new_user = User(id=user_id, username=user_data.username, role=user_data.role)
 
     if current_user:
         await log_user_activity(
@@ -38,8 +40,8 @@ async def create_user(db: AsyncSession, user_data: UserCreate, current_user):
             message=f"{current_user.role.capitalize()} created user '{new_user.username}' with role {new_user.role}"
         )
 
+    # UserOut only needs id, username and role, all known here
     await db.commit()
-    await db.refresh(new_user)
     return new_user
 
 
@@ -74,9 +76,10 @@ async def list_users(
 
 # GET USER BY ID
 async def get_user_by_id(db: AsyncSession, user_id: int):
-    result = await db.execute(select(User).where(User.id == user_id, User.is_active == True))
-    user = result.scalars().first()
-    if not user:
+    # Session.get checks the identity map first, so a user already loaded in
+    # this request (e.g. the authenticated user) costs no second SELECT.
+    user = await db.get(User, user_id)
+    if not user or not user.is_active:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
@@ -95,14 +98,10 @@ async def update_user(db: AsyncSession, user_id: int, user_data: UserUpdate, cur
         changes.append(f"username changed to '{user_data.username}'")
 
     if user_data.password:
-        if len(user_data.password) < 6:
-            raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
-        user.password_hash = hash_password(user_data.password)
+        user.password_hash = await asyncio.to_thread(hash_password, user_data.password)
         changes.append("password updated")
 
     if user_data.role and user_data.role != user.role:
-        if user_data.role not in ALLOWED_ROLES:
-            raise HTTPException(status_code=400, detail=f"Role must be one of {ALLOWED_ROLES}")
         user.role = user_data.role
         changes.append(f"role changed to '{user_data.role}'")
 
@@ -116,7 +115,6 @@ async def update_user(db: AsyncSession, user_id: int, user_data: UserUpdate, cur
         )
 
     await db.commit()
-    await db.refresh(user)
     return user
 
 
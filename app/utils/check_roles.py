@@ -1,18 +1,34 @@
 # app/utils/check_roles.py
-from fastapi import HTTPException
-from typing import Callable
-from functools import wraps
-
-
-def require_role(roles: list[str]):
-    """Decorator to validate user role; expects user to be passed by route."""
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, _user, **kwargs):
-            if _user is None:
-                raise HTTPException(status_code=401, detail="User not authenticated")
-            if _user.role.lower() not in [r.lower() for r in roles]:
-                raise HTTPException(status_code=403, detail="Permission denied")
-            return await func(*args, _user=_user, **kwargs)
-        return wrapper
-    return decorator
+from fastapi import Depends, HTTPException
+
+from app.models.user_models import User
+from app.utils.get_user import get_current_user
+
+# One bit per role; roles first seen in a checker get the next free bit.
+ROLE_BITS: dict[str, int] = {"admin": 1, "inventory": 2, "sales": 4, "cashier": 8}
+
+
+def _role_bit(role: str) -> int:
+    role = role.lower()
+    if role not in ROLE_BITS:
+        ROLE_BITS[role] = 1 << len(ROLE_BITS)
+    return ROLE_BITS[role]
+
+
+class RoleChecker:
+    """
+    Dependency that authenticates the user and checks their role in one step.
+    Usage: `_user=Depends(RoleChecker(["admin", "sales"]))`.
+    """
+
+    def __init__(self, roles: list[str]):
+        self.allowed_mask = 0
+        for role in roles:
+            self.allowed_mask |= _role_bit(role)
+
+    async def __call__(self, user: User = Depends(get_current_user)) -> User:
+        if user is None:
+            raise HTTPException(status_code=401, detail="User not authenticated")
+        if not ROLE_BITS.get(user.role.lower(), 0) & self.allowed_mask:
+            raise HTTPException(status_code=403, detail="Permission denied")
+        return user
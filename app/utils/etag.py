@@ -0,0 +1,38 @@
+# app/utils/etag.py
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def fetch_version(db: AsyncSession, model, obj_id: int) -> Optional[datetime]:
+    """
+    Read only the last-modified timestamp of a row (updated_at, falling back to created_at).
+    Returns None when the row does not exist.
+    """
+    updated_at = getattr(model, "updated_at", None)
+    version = func.coalesce(updated_at, model.created_at) if updated_at is not None else model.created_at
+    result = await db.execute(select(version).where(model.id == obj_id))
+    return result.scalar_one_or_none()
+
+
+def weak_etag(obj_id: int, *changed_at: Optional[datetime]) -> str:
+    stamps = "-".join(str(int(c.timestamp() * 1_000_000)) if c else "0" for c in changed_at)
+    return f'W/"{obj_id}-{stamps}"'
+
+
+def etag_headers(etag: str) -> dict:
+    """ETag plus Vary on the auth header, so shared caches never cross users."""
+    return {"ETag": etag, "Vary": "token"}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True when the client's If-None-Match already holds this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (candidate.strip() for candidate in header.split(","))
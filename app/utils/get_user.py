@@ -1,13 +1,59 @@
 # app/utils/get_user.py
+import logging
+
 from fastapi import Depends, HTTPException, status, Header
-from jose import jwt, JWTError
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from starlette.requests import Request
 
 from app.models.user_models import User
 from app.core.db import get_db
-from app.core.config import JWT_SECRET, JWT_ALGORITHM
+from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.security import decode_access_claims
+from app.core.cache import cached, store
+from app.middleware.auth_context import token_payload_ctx
+
+logger = logging.getLogger(__name__)
+
+# Everything get_current_user and the routes read from the user
+CACHED_USER_FIELDS = ("id", "username", "role", "token_version", "is_active")
+
+
+async def _load_user(db: AsyncSession, username: str) -> dict:
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    # The identity map only holds weak references; pinning the instance for the
+    # rest of the request lets later db.get(User, id) calls reuse it.
+    db.info["auth_user"] = user
+    return {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+
+
+async def store_cached_user(username: str, user=None):
+    """
+    Write a user's committed auth state into the cache after a logout or account
+    change; `user=None` records that no user holds `username` any more.
+    Overwriting (rather than deleting) the entry means a request that loaded the
+    user before the commit can't re-cache the old token_version, since the
+    read-through fill never replaces an existing key.
+    Fails the request if Redis can't be updated, since the cached token_version
+    and is_active would otherwise keep authenticating the user until the TTL.
+    """
+    value = {field: getattr(user, field) for field in CACHED_USER_FIELDS} if user is not None else None
+    try:
+        await store("auth_user", username, value, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    except Exception as e:
+        logger.error(f"Updating cached auth user '{username}' failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not revoke cached session; please retry.",
+        )
 
 
 async def get_current_user(
@@ -20,33 +66,39 @@ async def get_current_user(
     Enforces token_version validation for real-time logout invalidation.
     """
 
-    # Decode and verify JWT
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        username: str = payload.get("sub")
-        token_version: int = payload.get("token_version")
-
-        if username is None or token_version is None:
+    # Claims already decoded by AuthContextMiddleware; decode here only as a fallback
+    payload = token_payload_ctx.get()
+    if payload is None:
+        try:
+            payload = decode_access_claims(token)
+        except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload",
+                detail="Invalid or expired token",
             )
 
-    except JWTError:
+    username: str = payload.get("sub")
+    token_version: int = payload.get("token_version")
+
+    if username is None or token_version is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
+            detail="Invalid token payload",
         )
 
-    # Retrieve user from DB
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalars().first()
-
-    if not user:
+    # Retrieve user (Redis first when configured, DB on a miss). Logout and
+    # user changes overwrite this username's entry via store_cached_user().
+    user_data = await cached(
+        "auth_user", username, lambda: _load_user(db, username),
+        ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+    # None is what a rename leaves under the old username
+    if user_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    user = User(**user_data)
 
     # Check if token has been invalidated by version mismatch
     if user.token_version != token_version:
@@ -0,0 +1,67 @@
+# app/utils/pagination.py
+import base64
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, String, and_, literal, or_
+from sqlalchemy.types import TypeDecorator
+
+
+class _CursorTimestamp(TypeDecorator):
+    """
+    Binds the cursor timestamp so it compares correctly against created_at.
+    SQLite keeps server_default timestamps as 'YYYY-MM-DD HH:MM:SS' text, so the
+    bound value has to be rendered the same way for the comparison to hold.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if dialect.name == "sqlite" and value is not None:
+            return value.isoformat(sep=" ", timespec="microseconds" if value.microsecond else "seconds")
+        return value
+
+
+def encode_cursor(created_at: datetime, obj_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{obj_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Turn an opaque cursor back into the (created_at, id) of the last row seen."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, obj_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(obj_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def apply_keyset(stmt, model, after: Tuple[datetime, int], descending: bool = True):
+    """
+    Seek past the cursor row instead of OFFSET-ing to it.
+    Results must be ordered by (created_at, id) in the same direction.
+    """
+    created_at, obj_id = after
+    seek_at = literal(created_at, _CursorTimestamp())
+    if descending:
+        return stmt.where(or_(model.created_at < seek_at, and_(model.created_at == seek_at, model.id < obj_id)))
+    return stmt.where(or_(model.created_at > seek_at, and_(model.created_at == seek_at, model.id > obj_id)))
+
+
+def trim_page(rows: Sequence, page_size: int) -> Tuple[Sequence, bool]:
+    """Split a `page_size + 1` fetch into the page itself and whether more rows follow."""
+    return rows[:page_size], len(rows) > page_size
+
+
+def next_cursor(rows: Sequence, page_size: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if len(rows) < page_size or rows[-1].created_at is None:
+        return None
+    return encode_cursor(rows[-1].created_at, rows[-1].id)
@@ -1,24 +1,56 @@
+import asyncio
+import glob
+import hashlib
+import logging
 import os
+import tempfile
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from sqlalchemy import and_, select
+from sqlalchemy import select
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 
+from app.core.db import unloaded_relations
 from app.models.quotation_models import Quotation, QuotationItem
 from app.models.customer_models import Customer
 from app.models.product_models import Product
 
+logger = logging.getLogger(__name__)
 
+QUOTATION_DIR = "generated_pdfs"
 
-async def generate_quotation_pdf(db: AsyncSession, quotation_id: int):
+
+# File paths with a background render in flight
+_pending_renders: set[str] = set()
+
+
+def claim_quotation_render(file_path: str) -> bool:
+    """Reserve a background render; False when one is already running for this file."""
+    if file_path in _pending_renders:
+        return False
+    _pending_renders.add(file_path)
+    return True
+
+
+async def render_quotation_pdf(file_path: str, snapshot: dict):
+    """Background-task entry point for a render reserved by `claim_quotation_render`."""
+    try:
+        await asyncio.to_thread(_render_quotation_pdf, file_path, snapshot)
+    except Exception:
+        # Runs after the response; the claim is released so the next poll retries
+        logger.exception(f"Rendering quotation PDF {file_path} failed")
+    finally:
+        _pending_renders.discard(file_path)
+
+
+async def resolve_quotation_pdf(db: AsyncSession, quotation_id: int):
     """
-    Generate a professional quotation PDF with customer info,
-    items, GST, and total breakdown.
+    Return (file_path, snapshot) for a quotation without rendering anything.
+
+    The file name carries a hash of everything printed on it, so an unchanged
+    quotation maps to a file that is already on disk.
     """
 
     # -------------------------------
@@ -26,6 +58,7 @@ async def generate_quotation_pdf(db: AsyncSession, quotation_id: int):
     # -------------------------------
     result = await db.execute(
         select(Quotation)
+        .options(unloaded_relations())
         .where(Quotation.id == quotation_id, Quotation.is_deleted == False)
     )
     quotation = result.scalars().first()
@@ -35,58 +68,90 @@ async def generate_quotation_pdf(db: AsyncSession, quotation_id: int):
 
     # Fetch customer
     customer_result = await db.execute(
-        select(Customer).where(Customer.id == quotation.customer_id)
+        select(Customer).options(unloaded_relations()).where(Customer.id == quotation.customer_id)
     )
     customer = customer_result.scalars().first()
 
     # Fetch items
     item_result = await db.execute(
         select(QuotationItem)
+        .options(unloaded_relations())
         .where(QuotationItem.quotation_id == quotation.id, QuotationItem.is_deleted == False)
     )
     items = item_result.scalars().all()
 
-    # -------------------------------
-    # 2️⃣ Prepare file
-    # -------------------------------
-    os.makedirs("generated_pdfs", exist_ok=True)
-    file_name = f"quotation_{quotation.quotation_number or quotation.id}.pdf"
-    file_path = os.path.join("generated_pdfs", file_name)
-
-    doc = SimpleDocTemplate(
-        file_path,
-        pagesize=A4,
-        rightMargin=30,
-        leftMargin=30,
-        topMargin=30,
-        bottomMargin=30,
+    # Prefer current product names, fetched in one query
+    product_result = await db.execute(
+        select(Product.id, Product.name).where(
+            Product.id.in_({item.product_id for item in items}), Product.is_deleted == False
+        )
     )
+    product_names = dict(product_result.all())
+
+    # -------------------------------
+    # 2️⃣ Snapshot of everything printed
+    # -------------------------------
+    snapshot = {
+        "quotation_number": quotation.quotation_number,
+        "issue_date": quotation.issue_date.strftime('%d-%m-%Y'),
+        "notes": quotation.notes,
+        "gst_amount": float(quotation.gst_amount or 0),
+        "total_amount": float(quotation.total_amount or 0),
+        "customer": {
+            "name": customer.name,
+            "email": customer.email,
+            "phone": customer.phone,
+            "address": customer.address,
+        } if customer else None,
+        "items": [
+            (
+                product_names.get(item.product_id, item.product_name),
+                item.quantity,
+                float(item.unit_price),
+                float(item.total or 0),
+            )
+            for item in items
+        ],
+    }
+
+    # -------------------------------
+    # 3️⃣ Reuse the rendered file if nothing changed
+    # -------------------------------
+    os.makedirs(QUOTATION_DIR, exist_ok=True)
+    digest = hashlib.sha256(repr(snapshot).encode()).hexdigest()[:16]
+    prefix = f"quotation_{quotation.quotation_number or quotation.id}"
+    file_path = os.path.join(QUOTATION_DIR, f"{prefix}_{digest}.pdf")
+    return file_path, snapshot
+
+
+def _render_quotation_pdf(file_path: str, snapshot: dict):
     styles = getSampleStyleSheet()
     elements = []
 
     # -------------------------------
-    # 3️⃣ Header
+    # 4️⃣ Header
     # -------------------------------
     elements.append(Paragraph("<b>Sweven Interio Solutions</b>", styles["Title"]))
     elements.append(Paragraph("Billing & Interior Design Solutions", styles["Normal"]))
     elements.append(Paragraph("Email: support@sweveninterio.com | Phone: +91 98765 43210", styles["Normal"]))
     elements.append(Spacer(1, 12))
 
-    elements.append(Paragraph(f"<b>Quotation #: </b>{quotation.quotation_number}", styles["Heading2"]))
-    elements.append(Paragraph(f"Issue Date: {quotation.issue_date.strftime('%d-%m-%Y')}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>Quotation #: </b>{snapshot['quotation_number']}", styles["Heading2"]))
+    elements.append(Paragraph(f"Issue Date: {snapshot['issue_date']}", styles["Normal"]))
     elements.append(Spacer(1, 10))
 
     # -------------------------------
-    # 4️⃣ Customer Info
+    # 5️⃣ Customer Info
     # -------------------------------
+    customer = snapshot["customer"]
     if customer:
         elements.append(Paragraph("<b>Customer Details</b>", styles["Heading3"]))
-        elements.append(Paragraph(f"Name: {customer.name}", styles["Normal"]))
-        elements.append(Paragraph(f"Email: {customer.email}", styles["Normal"]))
-        elements.append(Paragraph(f"Phone: {customer.phone or '-'}", styles["Normal"]))
+        elements.append(Paragraph(f"Name: {customer['name']}", styles["Normal"]))
+        elements.append(Paragraph(f"Email: {customer['email']}", styles["Normal"]))
+        elements.append(Paragraph(f"Phone: {customer['phone'] or '-'}", styles["Normal"]))
 
         # Address might be JSON
-        address = customer.address
+        address = customer["address"]
         if isinstance(address, dict):
             addr_str = ", ".join(v for v in address.values() if v)
         else:
@@ -95,35 +160,27 @@ async def generate_quotation_pdf(db: AsyncSession, quotation_id: int):
         elements.append(Spacer(1, 12))
 
     # -------------------------------
-    # 5️⃣ Table Header
+    # 6️⃣ Table Header
     # -------------------------------
     data = [["#", "Product", "Qty", "Unit Price", "Total (Excl. GST)"]]
     subtotal = 0
 
-    for i, item in enumerate(items, start=1):
-        # Try to fetch product for better name if available
-        product_name = item.product_name
-        product_result = await db.execute(select(Product).where(Product.id == item.product_id))
-        product = product_result.scalars().first()
-        if product and not product.is_deleted:
-            product_name = product.name
-
-        total = float(item.total or 0)
+    for i, (product_name, quantity, unit_price, total) in enumerate(snapshot["items"], start=1):
         subtotal += total
 
         data.append([
             i,
             product_name,
-            item.quantity,
-            f"₹{float(item.unit_price):.2f}",
+            quantity,
+            f"₹{unit_price:.2f}",
             f"₹{total:.2f}",
         ])
 
     # -------------------------------
-    # 6️⃣ Totals Section
+    # 7️⃣ Totals Section
     # -------------------------------
-    gst_amt = float(quotation.gst_amount or 0)
-    grand_total = float(quotation.total_amount or subtotal + gst_amt)
+    gst_amt = snapshot["gst_amount"]
+    grand_total = snapshot["total_amount"] or subtotal + gst_amt
 
     data.append(["", "", "", "Subtotal", f"₹{subtotal:.2f}"])
     data.append(["", "", "", "GST (18%)", f"₹{gst_amt:.2f}"])
@@ -144,11 +201,11 @@ async def generate_quotation_pdf(db: AsyncSession, quotation_id: int):
     elements.append(Spacer(1, 20))
 
     # -------------------------------
-    # 7️⃣ Notes
+    # 8️⃣ Notes
     # -------------------------------
-    if quotation.notes:
+    if snapshot["notes"]:
         elements.append(Paragraph("<b>Notes:</b>", styles["Heading3"]))
-        elements.append(Paragraph(quotation.notes, styles["Normal"]))
+        elements.append(Paragraph(snapshot["notes"], styles["Normal"]))
         elements.append(Spacer(1, 12))
 
     elements.append(Paragraph("Thank you for choosing Sweven Interio Solutions!", styles["Normal"]))
@@ -157,5 +214,31 @@ async def generate_quotation_pdf(db: AsyncSession, quotation_id: int):
     # -------------------------------
     # ✅ Build PDF
     # -------------------------------
-    doc.build(elements)
-    return file_path
+    # A private temp file per render: other workers may render the same version
+    # concurrently, and only complete files may be published under its name.
+    fd, tmp_path = tempfile.mkstemp(dir=QUOTATION_DIR, suffix=".pdf")
+    os.close(fd)
+    doc = SimpleDocTemplate(
+        tmp_path,
+        pagesize=A4,
+        rightMargin=30,
+        leftMargin=30,
+        topMargin=30,
+        bottomMargin=30,
+    )
+    try:
+        doc.build(elements)
+        # Publish atomically so a concurrent download never sees a half-written file
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    # Drop renders of earlier versions of this quotation
+    prefix = os.path.basename(file_path).rsplit("_", 1)[0]
+    for stale in glob.glob(os.path.join(os.path.dirname(file_path), f"{prefix}_*.pdf")):
+        if stale != file_path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
@@ -6,8 +6,10 @@ from app.routers import (
     grns_router, invoice_router, loyality_router, payments_router, products_router,
     quotations_router, sales_orders_router, suppliers_router, transfers_router, users_router
 )
-from app.core.db import Base, engine, init_models
+from app.core.db import Base, engine, init_models, warm_pool
+from app.core.cache import init_cache, close_cache
 from app.middleware.activity_logger import ActivityLoggerMiddleware
+from app.middleware.auth_context import AuthContextMiddleware
 
 app = FastAPI(
     title="Backend Billing API",
@@ -23,6 +25,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(ActivityLoggerMiddleware)
+app.add_middleware(AuthContextMiddleware)
 
 # Health check endpoint
 @app.get("/", tags=["Health"])
@@ -52,3 +55,10 @@ app.include_router(users_router)
 @app.on_event("startup")
 async def on_startup():
     await init_models()
+    await warm_pool()
+    await init_cache()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await close_cache()
@@ -0,0 +1,44 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The app reads its settings at import time: use SQLite in a throwaway directory
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ["DB_TYPE"] = "sqlite"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.chdir(tempfile.mkdtemp())
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio calls app.core.cache makes."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b"0")) + 1).encode()
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    from app.core import cache
+
+    redis = FakeRedis()
+    monkeypatch.setattr(cache, "_redis", redis)
+    return redis
@@ -0,0 +1,62 @@
+# tests/test_auth_cache.py
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.cache import cached
+from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.db import AsyncSessionLocal, engine, init_models
+from app.core.security import create_access_token, hash_password
+from app.models.user_models import User
+from app.utils.get_user import _load_user, get_current_user
+
+auth_router = importlib.import_module("app.routers.auth_router")
+
+
+async def _logout_during_auth_load(username: str, fill_first: bool):
+    await init_models()
+    async with AsyncSessionLocal() as db:
+        user = User(username=username, password_hash=hash_password("secret123"), role="admin")
+        db.add(user)
+        await db.commit()
+    token = create_access_token({"sub": username}, token_version=user.token_version)
+
+    loaded, release = asyncio.Event(), asyncio.Event()
+
+    async def stale_load():
+        # A request that read the user before the logout committed
+        async with AsyncSessionLocal() as db:
+            data = await _load_user(db, username)
+        loaded.set()
+        await release.wait()
+        return data
+
+    fill = asyncio.create_task(
+        cached("auth_user", username, stale_load, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    )
+    await loaded.wait()
+    if fill_first:
+        release.set()
+        await fill
+
+    async with AsyncSessionLocal() as db:
+        current_user = SimpleNamespace(id=user.id, username=username)
+        await auth_router.logout(request=None, db=db, current_user=current_user)
+
+    release.set()
+    assert (await fill)["token_version"] == user.token_version
+
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(request=SimpleNamespace(state=SimpleNamespace()), token=token, db=db)
+    assert exc.value.status_code == 401
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("fill_first", [False, True])
+def test_logout_revokes_token_despite_concurrent_auth_load(fake_redis, fill_first):
+    username = f"race-{'fill' if fill_first else 'logout'}-first@x.com"
+    asyncio.run(_logout_during_auth_load(username, fill_first))
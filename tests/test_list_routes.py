@@ -0,0 +1,93 @@
+# tests/test_list_routes.py
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.core.db import AsyncSessionLocal, engine, init_models
+from app.core.security import hash_password
+from app.models.user_models import User
+
+ADMIN = {"username": "lists-admin@x.com", "password": "admin123"}
+
+# List services load relationships explicitly and raiseload the rest, so a
+# missing eager load surfaces here as an InvalidRequestError instead of a 500 in use
+LIST_ROUTES = [
+    "/activities/",
+    "/alerts/inventory",
+    "/billing/complaints",
+    "/billing/customers/",
+    "/grns",
+    "/invoices",
+    "/invoices/ready",
+    "/invoices/customer/{customer_id}",
+    "/loyalty/customer/{customer_id}",
+    "/payments",
+    "/products",
+    "/quotations",
+    "/quotations/customer/{customer_id}",
+    "/sales_orders/",
+    "/sales_orders/customer/{customer_id}",
+    "/sales_orders/quotations/status",
+    "/suppliers",
+    "/suppliers/{supplier_id}/full",
+    "/transfers",
+    "/users/",
+]
+
+
+async def _create_admin():
+    await init_models()
+    async with AsyncSessionLocal() as db:
+        db.add(User(username=ADMIN["username"], password_hash=hash_password(ADMIN["password"]), role="admin"))
+        await db.commit()
+    await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    asyncio.run(_create_admin())
+    with TestClient(main.app) as client:
+        headers = {"token": client.post("/auth/login", json=ADMIN).json()["access_token"]}
+
+        def post(path, payload=None):
+            response = client.post(path, headers=headers, json=payload)
+            assert response.status_code in (200, 201), response.text
+            return response.json()
+
+        supplier = post("/suppliers", {"name": "Acme", "email": "a@acme.com"})["data"]
+        product = post("/products", {
+            "name": "Chair", "category": "Furniture", "price": 1200, "supplier_id": supplier["id"],
+            "quantity_showroom": 10, "quantity_warehouse": 20, "min_stock_threshold": 5,
+        })["data"]
+        post("/grns", {
+            "supplier_id": supplier["id"], "purchase_order": "PO1", "notes": None, "bill_number": "B1", "bill_file": None,
+            "items": [{"product_id": product["id"], "quantity": 5, "price": 900}],
+        })
+        post("/transfers", {"product_id": product["id"], "quantity": 2, "from_location": "warehouse", "to_location": "showroom"})
+        customer = post("/billing/customers/", {"name": "Bob", "email": "bob@x.com", "phone": "999", "address": {"city": "X"}})["data"]
+
+        # One quotation goes straight to an invoice, one through a sales order and
+        # one waits in sales without an order yet
+        quotations = []
+        for _ in range(3):
+            quotation = post("/quotations/", {"customer_id": customer["id"], "items": [{"product_id": product["id"], "quantity": 1}]})["data"]
+            post(f"/quotations/{quotation['id']}/approve")
+            quotations.append(quotation)
+        post(f"/sales_orders/{quotations[1]['id']}")
+        post(f"/quotations/{quotations[2]['id']}/move-to-sales")
+        invoice = post("/invoices", {"quotation_id": quotations[0]["id"]})
+        post(f"/invoices/{invoice['id']}/approve", {})
+        bill = client.get(f"/invoices/{invoice['id']}/bill", headers=headers).json()
+        post(f"/invoices/payments/{invoice['id']}", {"amount": bill["balance_due"], "payment_method": "cash"})
+        post("/billing/complaints", {"customer_id": customer["id"], "invoice_id": invoice["id"], "title": "Damaged", "description": "Scratched"})
+
+        yield client, headers, {"customer_id": customer["id"], "supplier_id": supplier["id"]}
+
+
+@pytest.mark.parametrize("route", LIST_ROUTES)
+def test_list_route(seeded, route):
+    client, headers, ids = seeded
+    response = client.get(route.format(**ids), headers=headers)
+    assert response.status_code == 200, response.text